@@ -1,31 +1,58 @@
+import asyncio
+import importlib.util
 import json
 import re
+import threading
 from typing import Any, Dict, List, Optional
 from config import settings
+from records import TestSuggestion, Recommendation, intern_records
 
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+# Only look the package up here; importing openai is deferred to first AI use
+OPENAI_AVAILABLE = importlib.util.find_spec("openai") is not None
 
 class AIAnalyzer:
     """AI-powered analysis using OpenAI"""
 
     def __init__(self):
-        self.client = None
-        if OPENAI_AVAILABLE and settings.OPENAI_API_KEY:
-            self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self._client = None
+        self._client_lock = threading.Lock()
         self.model = settings.OPENAI_MODEL
 
+    @property
+    def client(self):
+        """
+        OpenAI client, imported and constructed on first use
+
+        Importing openai takes hundreds of milliseconds, so only touch this
+        off the event loop (see warm_up).
+        """
+        if self._client is None and self.is_available():
+            with self._client_lock:
+                if self._client is None:
+                    from openai import OpenAI
+
+                    self._client = OpenAI(
+                        api_key=settings.OPENAI_API_KEY,
+                        base_url=settings.OPENAI_BASE_URL,
+                        max_retries=settings.OPENAI_MAX_RETRIES,
+                    )
+        return self._client
+
+    def warm_up(self) -> None:
+        """Import openai and build the client ahead of the first AI call (blocking)"""
+        try:
+            self.client
+        except Exception as e:
+            print(f"AI client warm-up failed: {str(e)}")
+
     def is_available(self) -> bool:
         """Check if OpenAI is available"""
-        return self.client is not None
+        return OPENAI_AVAILABLE and bool(settings.OPENAI_API_KEY)
 
     async def analyze_with_ai(
         self,
         app_config: Dict[str, Any],
-        analysis_type: str
+        analysis_type: str,
     ) -> Optional[str]:
         """
         Analyze app using OpenAI
@@ -40,21 +67,28 @@ class AIAnalyzer:
         try:
             prompt = self._build_prompt(app_config, analysis_type)
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert DevOps and software architecture specialist. Analyze the provided application configuration and provide structured insights in JSON format."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=settings.OPENAI_TEMPERATURE,
-                max_tokens=2000,
-            )
+            # The client is synchronous and built lazily; both the call and
+            # a first-use construction run on a worker thread so concurrent
+            # AI sections don't block the event loop (profiled runs included;
+            # there the call shows up as await time)
+            def create():
+                return self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are an expert DevOps and software architecture specialist. Analyze the provided application configuration and provide structured insights in JSON format."
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    temperature=settings.OPENAI_TEMPERATURE,
+                    max_tokens=2000,
+                )
+
+            response = await asyncio.get_running_loop().run_in_executor(None, create)
 
             return response.choices[0].message.content
         except Exception as e:
@@ -163,61 +197,77 @@ Return ONLY valid JSON, no markdown or extra text.
     @staticmethod
     def generate_test_suggestions_default() -> List[Dict[str, Any]]:
         """Generate default test suggestions when AI is unavailable"""
-        return [
-            {
-                "type": "API",
-                "title": "API Integration Tests",
-                "description": "Test all external API calls and integrations",
-                "priority": "High",
-                "estimatedDuration": "2-3 days"
-            },
-            {
-                "type": "UI",
-                "title": "User Interface Testing",
-                "description": "Comprehensive UI testing across components",
-                "priority": "High",
-                "estimatedDuration": "3-4 days"
-            },
-            {
-                "type": "Load",
-                "title": "Load Testing",
-                "description": "Performance testing under expected peak load",
-                "priority": "High",
-                "estimatedDuration": "2 days"
-            },
-            {
-                "type": "Security",
-                "title": "Security Assessment",
-                "description": "Security scanning for vulnerabilities",
-                "priority": "Critical",
-                "estimatedDuration": "3-5 days"
-            },
-            {
-                "type": "Automation",
-                "title": "Test Automation",
-                "description": "Set up CI/CD with automated testing",
-                "priority": "Medium",
-                "estimatedDuration": "4-5 days"
-            }
-        ]
+        return [sugg._asdict() for sugg in DEFAULT_TEST_SUGGESTIONS]
 
-    @staticmethod
-    def generate_scale_analysis_default() -> Dict[str, Any]:
-        """Generate default scale analysis when AI is unavailable"""
-        return {
-            "title": "Production Scale Analysis",
-            "breakingPoints": [
-                "Database query performance may degrade with >100k records",
-                "Cache layer needed for API calls exceeding 1000/min",
-                "Load balancing required for >50 concurrent users",
-                "Authentication throughput bottleneck at >500 requests/min"
-            ],
-            "recommendations": [
-                "Implement database query optimization and indexing strategy",
-                "Add caching layer (Redis) for frequently accessed data",
-                "Use CDN for static assets",
-                "Implement auto-scaling policies",
-                "Set up monitoring and alerting"
-            ],
-            "readinessLevel": "Partially Ready"
-        }
+
+# Fallback content used when AI is unavailable, shared by every result
+DEFAULT_TEST_SUGGESTIONS = (
+    TestSuggestion(
+        type="API",
+        title="API Integration Tests",
+        description="Test all external API calls and integrations",
+        priority="High",
+        estimatedDuration="2-3 days"
+    ),
+    TestSuggestion(
+        type="UI",
+        title="User Interface Testing",
+        description="Comprehensive UI testing across components",
+        priority="High",
+        estimatedDuration="3-4 days"
+    ),
+    TestSuggestion(
+        type="Load",
+        title="Load Testing",
+        description="Performance testing under expected peak load",
+        priority="High",
+        estimatedDuration="2 days"
+    ),
+    TestSuggestion(
+        type="Security",
+        title="Security Assessment",
+        description="Security scanning for vulnerabilities",
+        priority="Critical",
+        estimatedDuration="3-5 days"
+    ),
+    TestSuggestion(
+        type="Automation",
+        title="Test Automation",
+        description="Set up CI/CD with automated testing",
+        priority="Medium",
+        estimatedDuration="4-5 days"
+    ),
+)
+
+DEFAULT_RECOMMENDATIONS = (
+    Recommendation(
+        priority="High",
+        category="Security",
+        action="Implement Authentication",
+        rationale="Critical security requirement",
+        estimatedEffort="3-5 days"
+    ),
+    Recommendation(
+        priority="High",
+        category="Performance",
+        action="Add Caching Layer",
+        rationale="Improves response times under load",
+        estimatedEffort="2-3 days"
+    ),
+    Recommendation(
+        priority="Medium",
+        category="Testing",
+        action="Setup Test Framework",
+        rationale="Ensures code quality",
+        estimatedEffort="2 days"
+    ),
+    Recommendation(
+        priority="Medium",
+        category="Architecture",
+        action="Refactor to Microservices",
+        rationale="Better scalability and maintainability",
+        estimatedEffort="2-3 weeks"
+    ),
+)
+
+intern_records(*DEFAULT_TEST_SUGGESTIONS, *DEFAULT_RECOMMENDATIONS)
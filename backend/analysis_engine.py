@@ -1,21 +1,49 @@
 import json
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from datetime import datetime
-from models import (
-    CategoryScoreModel,
-    RiskModel,
-    InsightModel,
-    TestSuggestionModel,
-    ScaleAnalysisModel,
-    RecommendationModel,
-    AnalysisResultModel,
+from records import CategoryScore, Risk, Insight, intern_records
+from dependency_graph import DependencyStats
+
+# Risk records are constant per rule, so they are built once and shared
+MISSING_CACHE_RISK = Risk(
+    category="Scalability",
+    severity="High",
+    title="Missing Cache Layer",
+    description="No caching mechanism found in dependencies",
+    impact="Performance degradation under load",
+    mitigation="Implement Redis or similar caching solution"
 )
+NO_AUTHENTICATION_RISK = Risk(
+    category="Security",
+    severity="Critical",
+    title="No Authentication Detected",
+    description="Application lacks authentication mechanism",
+    impact="Unauthorized access to sensitive data",
+    mitigation="Implement OAuth 2.0 or JWT authentication"
+)
+PERFORMANCE_BOTTLENECK_RISK = Risk(
+    category="Performance",
+    severity="High",
+    title="Potential Performance Bottlenecks",
+    description="Expected user count suggests high load",
+    impact="Potential slowdowns during peak usage",
+    mitigation="Implement performance optimization and load testing"
+)
+NO_TEST_FRAMEWORK_RISK = Risk(
+    category="Testability",
+    severity="Medium",
+    title="No Testing Framework",
+    description="Testing framework not found in dependencies",
+    impact="Difficulty ensuring code quality",
+    mitigation="Add Jest, Pytest, or similar testing framework"
+)
+intern_records(MISSING_CACHE_RISK, NO_AUTHENTICATION_RISK, PERFORMANCE_BOTTLENECK_RISK, NO_TEST_FRAMEWORK_RISK)
 
 class RuleBasedAnalyzer:
     """Rule-based analysis engine for scoring categories"""
 
     @staticmethod
-    def analyze_scalability(app_config: Dict[str, Any]) -> CategoryScoreModel:
+    def analyze_scalability(app_config: Dict[str, Any]) -> CategoryScore:
         """Analyze scalability aspects"""
         score = 75
         issues = []
@@ -42,15 +70,18 @@ class RuleBasedAnalyzer:
             issues.append("Application targets high user count without scalability patterns")
             suggestions.append("Implement load balancing and horizontal scaling strategies")
 
-        return CategoryScoreModel(
+        return CategoryScore(
             score=max(0, min(100, score)),
             level=RuleBasedAnalyzer._get_level(score),
-            issues=issues,
-            suggestions=suggestions[:2]
+            issues=tuple(issues),
+            suggestions=tuple(suggestions[:2])
         )
 
     @staticmethod
-    def analyze_security(app_config: Dict[str, Any]) -> CategoryScoreModel:
+    def analyze_security(
+        app_config: Dict[str, Any],
+        dependency_stats: Optional[DependencyStats] = None,
+    ) -> CategoryScore:
         """Analyze security aspects"""
         score = 70
         issues = []
@@ -75,15 +106,21 @@ class RuleBasedAnalyzer:
             score -= 5
             issues.append("No dependencies listed")
 
-        return CategoryScoreModel(
+        # Check transitive supply-chain surface from the lockfile
+        if dependency_stats and dependency_stats.totalPackages > 1000:
+            score -= 5
+            issues.append(f"Large supply-chain surface: {dependency_stats.totalPackages} transitive packages")
+            suggestions.append("Run dependency audits (npm audit, pip-audit) in CI")
+
+        return CategoryScore(
             score=max(0, min(100, score)),
             level=RuleBasedAnalyzer._get_level(score),
-            issues=issues,
-            suggestions=suggestions[:2]
+            issues=tuple(issues),
+            suggestions=tuple(suggestions[:2])
         )
 
     @staticmethod
-    def analyze_testability(app_config: Dict[str, Any]) -> CategoryScoreModel:
+    def analyze_testability(app_config: Dict[str, Any]) -> CategoryScore:
         """Analyze testability aspects"""
         score = 72
         issues = []
@@ -113,15 +150,18 @@ class RuleBasedAnalyzer:
             score -= 8
             issues.append("Minimal component structure for testing")
 
-        return CategoryScoreModel(
+        return CategoryScore(
             score=max(0, min(100, score)),
             level=RuleBasedAnalyzer._get_level(score),
-            issues=issues,
-            suggestions=suggestions[:2]
+            issues=tuple(issues),
+            suggestions=tuple(suggestions[:2])
         )
 
     @staticmethod
-    def analyze_maintainability(app_config: Dict[str, Any]) -> CategoryScoreModel:
+    def analyze_maintainability(
+        app_config: Dict[str, Any],
+        dependency_stats: Optional[DependencyStats] = None,
+    ) -> CategoryScore:
         """Analyze maintainability aspects"""
         score = 75
         issues = []
@@ -149,15 +189,25 @@ class RuleBasedAnalyzer:
             score -= 5
             issues.append("Limited dependency usage")
 
-        return CategoryScoreModel(
+        # Check the transitive dependency graph from the lockfile
+        if dependency_stats:
+            if dependency_stats.maxDepth > 10:
+                score -= 5
+                issues.append(f"Deep transitive dependency tree (depth {dependency_stats.maxDepth})")
+            if len(dependency_stats.duplicateVersions) > 10:
+                score -= 5
+                issues.append(f"{len(dependency_stats.duplicateVersions)} packages installed in multiple versions")
+                suggestions.append("Deduplicate dependencies (npm dedupe) and align version ranges")
+
+        return CategoryScore(
             score=max(0, min(100, score)),
             level=RuleBasedAnalyzer._get_level(score),
-            issues=issues,
-            suggestions=suggestions[:2]
+            issues=tuple(issues),
+            suggestions=tuple(suggestions[:2])
         )
 
     @staticmethod
-    def analyze_performance(app_config: Dict[str, Any]) -> CategoryScoreModel:
+    def analyze_performance(app_config: Dict[str, Any]) -> CategoryScore:
         """Analyze performance aspects"""
         score = 78
         issues = []
@@ -185,11 +235,11 @@ class RuleBasedAnalyzer:
             score -= 5
             issues.append("Potential synchronous operations detected")
 
-        return CategoryScoreModel(
+        return CategoryScore(
             score=max(0, min(100, score)),
             level=RuleBasedAnalyzer._get_level(score),
-            issues=issues,
-            suggestions=suggestions[:2]
+            issues=tuple(issues),
+            suggestions=tuple(suggestions[:2])
         )
 
     @staticmethod
@@ -207,65 +257,40 @@ class RuleBasedAnalyzer:
             return "Critical"
 
     @staticmethod
-    def generate_risks(app_config: Dict[str, Any]) -> List[RiskModel]:
+    def generate_risks(app_config: Dict[str, Any]) -> List[Risk]:
         """Generate risk report"""
         risks = []
 
         # Scalability risks
         dependencies = app_config.get("dependencies", {})
         if "redis" not in str(dependencies).lower():
-            risks.append(RiskModel(
-                category="Scalability",
-                severity="High",
-                title="Missing Cache Layer",
-                description="No caching mechanism found in dependencies",
-                impact="Performance degradation under load",
-                mitigation="Implement Redis or similar caching solution"
-            ))
+            risks.append(MISSING_CACHE_RISK)
 
         # Security risks
         if "auth" not in str(app_config).lower():
-            risks.append(RiskModel(
-                category="Security",
-                severity="Critical",
-                title="No Authentication Detected",
-                description="Application lacks authentication mechanism",
-                impact="Unauthorized access to sensitive data",
-                mitigation="Implement OAuth 2.0 or JWT authentication"
-            ))
+            risks.append(NO_AUTHENTICATION_RISK)
 
         # Performance risks
         metadata = app_config.get("metadata", {})
         expected_users = metadata.get("estimatedUsers", 0)
         if expected_users > 5000:
-            risks.append(RiskModel(
-                category="Performance",
-                severity="High",
-                title="Potential Performance Bottlenecks",
-                description="Expected user count suggests high load",
-                impact="Potential slowdowns during peak usage",
-                mitigation="Implement performance optimization and load testing"
-            ))
+            risks.append(PERFORMANCE_BOTTLENECK_RISK)
 
         # Testability risks
         if "jest" not in str(dependencies).lower() and "pytest" not in str(dependencies).lower():
-            risks.append(RiskModel(
-                category="Testability",
-                severity="Medium",
-                title="No Testing Framework",
-                description="Testing framework not found in dependencies",
-                impact="Difficulty ensuring code quality",
-                mitigation="Add Jest, Pytest, or similar testing framework"
-            ))
+            risks.append(NO_TEST_FRAMEWORK_RISK)
 
         return risks
 
     @staticmethod
-    def generate_insights(app_config: Dict[str, Any]) -> List[InsightModel]:
+    def generate_insights(
+        app_config: Dict[str, Any],
+        dependency_stats: Optional[DependencyStats] = None,
+    ) -> List[Insight]:
         """Generate key insights"""
         insights = []
 
-        insights.append(InsightModel(
+        insights.append(Insight(
             category="Architecture",
             title="Application Structure",
             description=f"App '{app_config.get('name', 'Untitled')}' uses block-based architecture with {len(app_config.get('blocks', {}).get('components', []))} components",
@@ -273,15 +298,29 @@ class RuleBasedAnalyzer:
         ))
 
         dependencies = app_config.get("dependencies", {})
-        insights.append(InsightModel(
+        insights.append(Insight(
             category="Dependencies",
             title="Dependency Analysis",
             description=f"Application has {len(dependencies)} dependencies. {len([d for d in dependencies if 'dev' not in d])} are production dependencies.",
             actionable=False
         ))
 
+        if dependency_stats:
+            hot_spots = ", ".join(f"{name} ({count})" for name, count in dependency_stats.fanInHotSpots[:3])
+            insights.append(Insight(
+                category="Dependencies",
+                title="Dependency Graph",
+                description=(
+                    f"Lockfile resolves {dependency_stats.totalPackages} packages "
+                    f"({dependency_stats.directCount} direct), max depth {dependency_stats.maxDepth}, "
+                    f"{len(dependency_stats.duplicateVersions)} with duplicate versions."
+                    + (f" Most depended-on: {hot_spots}." if hot_spots else "")
+                ),
+                actionable=bool(dependency_stats.duplicateVersions)
+            ))
+
         metadata = app_config.get("metadata", {})
-        insights.append(InsightModel(
+        insights.append(Insight(
             category="Scale",
             title="Target Scale",
             description=f"Estimated for {metadata.get('estimatedUsers', 'unknown')} users",
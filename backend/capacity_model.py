@@ -0,0 +1,246 @@
+import hashlib
+import math
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, NamedTuple
+from config import settings
+from records import ScaleAnalysis
+
+if TYPE_CHECKING:
+    import numpy as np  # imported on first simulation
+
+# Tier sizing assumed for a single deployment unit
+SYNC_WORKERS = 8
+ASYNC_WORKERS = 32
+DB_CONNECTIONS = 10
+
+BASE_SERVICE_TIME = 0.05  # seconds of app-tier work per request
+DB_QUERY_TIME = 0.005  # seconds per database query
+CACHE_HIT_RATIO = 0.7  # expected share of queries served from cache
+TARGET_UTILIZATION = 0.8
+ASSUMED_USERS = 1000  # when metadata.estimatedUsers is missing
+
+COMPLEXITY_FACTORS = {"low": 0.8, "medium": 1.0, "high": 1.4}
+
+# Traffic patterns: (probability, low, high) of the peak-to-average multiplier
+TRAFFIC_PATTERNS = (
+    (0.50, 1.0, 1.5),  # steady
+    (0.35, 1.5, 3.0),  # diurnal
+    (0.15, 3.0, 8.0),  # spiky / launch events
+)
+
+# User levels (multiples of the declared users, geometric steps) scanned for
+# the latency breaking point
+LOAD_LEVEL_MIN = 0.01
+LOAD_LEVEL_MAX = 100
+LOAD_LEVEL_COUNT = 25
+
+
+class CapacityFeatures(NamedTuple):
+    """Config features that drive the capacity model"""
+    users: int
+    usersAssumed: bool
+    hasCache: bool
+    hasAsync: bool
+    components: int
+    complexity: float
+
+
+def extract_features(app_config: Dict[str, Any]) -> CapacityFeatures:
+    """Detect capacity-relevant features the same way the rule engine does"""
+    dependencies = str(app_config.get("dependencies", {})).lower()
+    metadata = app_config.get("metadata", {})
+    components = app_config.get("blocks", {}).get("components", [])
+
+    users = metadata.get("estimatedUsers") or 0
+    users = int(users) if isinstance(users, (int, float)) and users > 0 else 0
+
+    return CapacityFeatures(
+        users=users or ASSUMED_USERS,
+        usersAssumed=not users,
+        hasCache="redis" in dependencies or "cache" in dependencies,
+        hasAsync="async" in dependencies or "queue" in dependencies,
+        components=len(components) if isinstance(components, list) else 0,
+        complexity=COMPLEXITY_FACTORS.get(metadata.get("complexity", "medium"), 1.0),
+    )
+
+
+def _erlang_c_wait(offered_load: "np.ndarray", servers: int, service_time: "np.ndarray") -> "np.ndarray":
+    """
+    Mean M/M/c queueing delay, vectorized over scenarios
+
+    Args:
+        offered_load: Arrival rate x service time (Erlangs)
+        servers: Number of parallel servers (c)
+        service_time: Mean service time per request in seconds
+
+    Returns:
+        Mean wait in queue (inf where the station is saturated)
+    """
+    import numpy as np
+
+    # Erlang B by recursion, then Erlang C from it
+    blocking = np.ones_like(offered_load)
+    for k in range(1, servers + 1):
+        blocking = offered_load * blocking / (k + offered_load * blocking)
+
+    saturated = offered_load >= servers
+    load = np.where(saturated, 0.0, offered_load)
+    wait_probability = servers * blocking / (servers - load * (1 - blocking))
+    return np.where(saturated, np.inf, wait_probability * service_time / (servers - load))
+
+
+@lru_cache(maxsize=1024)
+def simulate(features: CapacityFeatures, scenarios: int, seed: int) -> Dict[str, Any]:
+    """
+    Monte Carlo over traffic scenarios through an app tier and a database tier
+
+    Every scenario draws the share of users active at peak, their request
+    rate, the traffic pattern's peak multiplier, service-time jitter and the
+    cache hit ratio; each tier is then an M/M/c station. Results are
+    deterministic per features and seed, so they are cached.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+
+    active_share = rng.beta(2, 18, scenarios)  # mean 10% of users active at peak
+    request_rate = rng.lognormal(np.log(0.2), 0.5, scenarios)  # requests/s per active user
+
+    probabilities, lows, highs = (np.array(column) for column in zip(*TRAFFIC_PATTERNS))
+    pattern = rng.choice(len(TRAFFIC_PATTERNS), scenarios, p=probabilities)
+    peak = rng.uniform(lows[pattern], highs[pattern])
+
+    jitter = rng.lognormal(0.0, 0.3, scenarios)
+    app_service = BASE_SERVICE_TIME * features.complexity * (1 + features.components / 50) * jitter
+    queries = 2 + features.components / 20
+    hit_ratio = rng.beta(7, 3, scenarios) if features.hasCache else np.zeros(scenarios)
+    db_service = queries * DB_QUERY_TIME * (1 - hit_ratio) * jitter
+    db_service = np.maximum(db_service, 1e-6)
+
+    app_workers = ASYNC_WORKERS if features.hasAsync else SYNC_WORKERS
+
+    # Requests/s generated per declared user in each scenario
+    rate_per_user = active_share * request_rate * peak
+
+    # Users at which each tier reaches the target utilization
+    app_break = TARGET_UTILIZATION * app_workers / (rate_per_user * app_service)
+    db_break = TARGET_UTILIZATION * DB_CONNECTIONS / (rate_per_user * db_service)
+
+    # Response time at the declared scale and on a grid of load levels
+    load_levels = np.geomspace(LOAD_LEVEL_MIN, LOAD_LEVEL_MAX, LOAD_LEVEL_COUNT)
+    users = features.users * load_levels[:, None]  # levels x scenarios
+    arrival = users * rate_per_user
+    response = (
+        app_service + _erlang_c_wait(arrival * app_service, app_workers, app_service)
+        + db_service + _erlang_c_wait(arrival * db_service, DB_CONNECTIONS, db_service)
+    )
+    # "higher" avoids interpolating between saturated (inf) scenarios
+    p95_by_level = np.percentile(response, 95, axis=1, method="higher")
+    breach = np.flatnonzero(p95_by_level > settings.CAPACITY_LATENCY_SLO)
+
+    declared_arrival = features.users * rate_per_user
+    declared_response = (
+        app_service + _erlang_c_wait(declared_arrival * app_service, app_workers, app_service)
+        + db_service + _erlang_c_wait(declared_arrival * db_service, DB_CONNECTIONS, db_service)
+    )
+    saturated = (declared_arrival * app_service >= app_workers) | (declared_arrival * db_service >= DB_CONNECTIONS)
+
+    return {
+        "scenarios": scenarios,
+        "appWorkers": app_workers,
+        "appBreakUsers": float(np.percentile(app_break, 10)),
+        "dbBreakUsers": float(np.percentile(db_break, 10)),
+        "sloBreachUsers": float(features.users * load_levels[breach[0]]) if breach.size else None,
+        "saturationProbability": float(saturated.mean()),
+        "declaredP95": float(np.percentile(declared_response, 95, method="higher")),
+        "peakRequestRate": float(np.percentile(declared_arrival, 95)),
+    }
+
+
+def _seed(features: CapacityFeatures) -> int:
+    """Stable seed so the same config always gets the same estimate"""
+    return int.from_bytes(hashlib.sha256(repr(tuple(features)).encode()).digest()[:8], "little")
+
+
+def _users(value: float) -> str:
+    if value >= 1_000_000:
+        return f"{value / 1_000_000:.1f}M"
+    if value >= 10_000:
+        return f"{value / 1000:.0f}k"
+    return f"{value:,.0f}"
+
+
+def _readiness(simulation: Dict[str, Any]) -> str:
+    """Ready / Partially Ready / Not Ready from saturation risk and p95 latency"""
+    slo = settings.CAPACITY_LATENCY_SLO
+    if simulation["saturationProbability"] < 0.05 and simulation["declaredP95"] <= slo:
+        return "Ready"
+    if simulation["saturationProbability"] < 0.5:
+        return "Partially Ready"
+    return "Not Ready"
+
+
+def analyze_capacity(app_config: Dict[str, Any]) -> ScaleAnalysis:
+    """
+    Estimate breaking points and readiness for the app's declared scale
+
+    Args:
+        app_config: Application configuration
+
+    Returns:
+        Scale analysis record with computed breaking points and readiness
+    """
+    features = extract_features(app_config)
+    simulation = simulate(features, settings.CAPACITY_SCENARIOS, _seed(features))
+    scenarios = simulation["scenarios"]
+    declared = _users(features.users) + (" (assumed)" if features.usersAssumed else "")
+
+    breaking_points = [
+        f"App tier reaches {TARGET_UTILIZATION:.0%} utilization at ~{_users(simulation['appBreakUsers'])} users "
+        f"({simulation['appWorkers']} {'async' if features.hasAsync else 'sync'} workers per instance)",
+        f"Database reaches {TARGET_UTILIZATION:.0%} utilization at ~{_users(simulation['dbBreakUsers'])} users "
+        f"({'with' if features.hasCache else 'without'} caching, {DB_CONNECTIONS} connections)",
+    ]
+    if simulation["sloBreachUsers"] is not None:
+        breaking_points.append(
+            f"p95 response time exceeds {settings.CAPACITY_LATENCY_SLO:g}s by "
+            f"~{_users(simulation['sloBreachUsers'])} users"
+        )
+    else:
+        breaking_points.append(
+            f"p95 response time stays under {settings.CAPACITY_LATENCY_SLO:g}s up to "
+            f"{_users(features.users * LOAD_LEVEL_MAX)} users"
+        )
+    breaking_points.append(
+        f"At {declared} users, {simulation['saturationProbability']:.0%} of {scenarios} simulated traffic "
+        f"scenarios saturate; p95 response {simulation['declaredP95'] * 1000:.0f} ms"
+        if math.isfinite(simulation["declaredP95"]) else
+        f"At {declared} users, {simulation['saturationProbability']:.0%} of {scenarios} simulated traffic "
+        f"scenarios saturate"
+    )
+
+    recommendations = []
+    bottleneck = min(simulation["appBreakUsers"], simulation["dbBreakUsers"])
+    if bottleneck < features.users:
+        instances = math.ceil(features.users / max(simulation["appBreakUsers"], 1))
+        if simulation["appBreakUsers"] < features.users:
+            recommendations.append(f"Run at least {instances} app instances behind a load balancer for {declared} users")
+        if simulation["dbBreakUsers"] < features.users:
+            recommendations.append("Add read replicas or connection pooling; the database saturates below the declared scale")
+    if not features.hasCache:
+        recommendations.append(
+            f"Add caching layer (Redis) to cut database load ~{1 / (1 - CACHE_HIT_RATIO):.0f}x"
+        )
+    if not features.hasAsync:
+        recommendations.append(
+            f"Move long-running work to async workers/queues to raise concurrency from {SYNC_WORKERS} to {ASYNC_WORKERS} per instance"
+        )
+    recommendations.append(f"Load-test at {simulation['peakRequestRate']:.0f} req/s (P95 simulated peak)")
+    recommendations.append("Set up monitoring and alerting on utilization and p95 latency")
+
+    return ScaleAnalysis(
+        title="Production Scale Analysis",
+        breakingPoints=tuple(breaking_points),
+        recommendations=tuple(recommendations),
+        readinessLevel=_readiness(simulation),
+    )
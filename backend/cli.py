@@ -0,0 +1,245 @@
+"""
+Offline batch analyzer
+
+Analyzes app configs without running the API server. Inputs may be JSON
+config files, ZIP bundles (metadata.json / blocks.json / dependencies.json /
+config.json, as accepted by the upload page, plus an optional
+package-lock.json or requirements.txt), directories or glob patterns.
+Files are spread over a process pool and results stream out as JSON Lines.
+
+    python cli.py configs/ bundles/*.zip --min-score 70 > results.jsonl
+    python cli.py "apps/**/*.json" --workers 8 --ai --output results.jsonl
+    python cli.py app.json --sections security,testability --min-score 60
+
+Exit codes: 0 all analyzed apps meet --min-score, 1 some app scored below it,
+2 some input could not be loaded or analyzed. With --sections, only those
+sections are computed and --min-score applies to the overall score if it
+was requested, otherwise to the lowest computed category score.
+"""
+import argparse
+import asyncio
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import zipfile
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from dependency_graph import LOCKFILE_NAMES
+
+CONFIG_EXTENSIONS = (".json", ".zip")
+BUNDLE_FILES = ("metadata", "blocks", "dependencies", "config")
+
+EXIT_OK = 0
+EXIT_BELOW_THRESHOLD = 1
+EXIT_INPUT_ERROR = 2
+
+
+def discover_inputs(patterns: List[str]) -> List[str]:
+    """Expand files, directories and glob patterns into config paths"""
+    found: List[str] = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, files in os.walk(pattern):
+                found.extend(
+                    os.path.join(root, name)
+                    for name in sorted(files)
+                    if name.lower().endswith(CONFIG_EXTENSIONS)
+                )
+        elif glob.has_magic(pattern):
+            found.extend(
+                path for path in sorted(glob.glob(pattern, recursive=True))
+                if os.path.isfile(path) and path.lower().endswith(CONFIG_EXTENSIONS)
+            )
+        else:
+            found.append(pattern)
+
+    # Keep order, drop duplicates from overlapping patterns
+    return list(dict.fromkeys(found))
+
+
+def load_bundle(path: str) -> Dict[str, Any]:
+    """Combine the JSON files of a ZIP bundle into an app config"""
+    files: Dict[str, Any] = {}
+    lockfile = None
+    with zipfile.ZipFile(path) as archive:
+        names = set(archive.namelist())
+        for bundle_file in BUNDLE_FILES:
+            if f"{bundle_file}.json" in names:
+                files[bundle_file] = json.loads(archive.read(f"{bundle_file}.json"))
+        for lockfile_name in LOCKFILE_NAMES:
+            if lockfile_name in names:
+                lockfile = (lockfile_name, archive.read(lockfile_name).decode("utf-8"))
+                break
+
+    metadata = files.get("metadata") or {}
+    config = files.get("config") or {}
+    fallback_name = os.path.splitext(os.path.basename(path))[0]
+
+    bundle = {
+        "name": metadata.get("name") or config.get("name") or fallback_name,
+        "description": metadata.get("description") or config.get("description") or "",
+        "blocks": files.get("blocks") or config.get("blocks") or {},
+        "dependencies": files.get("dependencies") or config.get("dependencies") or {},
+        "metadata": {
+            **metadata,
+            "createdAt": metadata.get("createdAt") or datetime.now().isoformat(),
+            "version": metadata.get("version") or "1.0.0",
+        },
+    }
+    if lockfile:
+        bundle["lockfileName"], bundle["lockfile"] = lockfile
+    return bundle
+
+
+def load_config(path: str) -> Dict[str, Any]:
+    """Load a JSON config or ZIP bundle as an app config dict"""
+    if path.lower().endswith(".zip"):
+        return load_bundle(path)
+
+    with open(path, "rb") as f:
+        config = json.loads(f.read())
+
+    # Accept full analysis requests as well as bare app configs
+    if "appConfig" in config:
+        config = config["appConfig"]
+    return config
+
+
+def _init_worker(use_ai: bool, sections: Optional[Tuple[str, ...]] = None) -> None:
+    """Import the engine once per worker process"""
+    global _perform_analysis, _analyze_sections, _AppConfigModel, _use_ai, _sections
+    from pipeline import analyze_sections, perform_analysis
+    from models import AppConfigModel
+
+    _perform_analysis = perform_analysis
+    _analyze_sections = analyze_sections
+    _AppConfigModel = AppConfigModel
+    _use_ai = use_ai
+    _sections = sections
+
+
+def analyze_file(path: str) -> Dict[str, Any]:
+    """Analyze one input in a worker; errors are reported, not raised"""
+    try:
+        app_config = _AppConfigModel(**load_config(path)).model_dump(exclude_none=True)
+        if _sections:
+            data = asyncio.run(_analyze_sections(app_config, app_config["name"], _sections, use_ai=_use_ai))
+            return {"path": path, "success": True, "data": data}
+        result = asyncio.run(_perform_analysis(app_config, app_config["name"], use_ai=_use_ai))
+        return {"path": path, "success": True, "data": result.to_model().model_dump()}
+    except Exception as e:
+        return {"path": path, "success": False, "error": f"{type(e).__name__}: {e}"}
+
+
+def available_cores() -> int:
+    """CPUs this process may run on (respects affinity / container limits)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def run(
+    paths: List[str],
+    workers: int,
+    use_ai: bool,
+    sections: Optional[Tuple[str, ...]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield results as workers finish them"""
+    if workers <= 1 or len(paths) <= 1:
+        _init_worker(use_ai, sections)
+        yield from map(analyze_file, paths)
+        return
+
+    # Batch small files per task to amortize inter-process overhead
+    chunksize = max(1, min(64, len(paths) // (workers * 4)))
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(use_ai, sections)) as pool:
+        yield from pool.imap_unordered(analyze_file, paths, chunksize=chunksize)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Analyze app configs offline and write JSON Lines")
+    parser.add_argument("inputs", nargs="+", help="Config JSON files, ZIP bundles, directories or globs")
+    parser.add_argument("--workers", type=int, default=available_cores(),
+                        help="Worker processes (default: available cores)")
+    parser.add_argument("--ai", action="store_true", help="Enable LLM-backed sections (needs OPENAI_API_KEY)")
+    parser.add_argument("--min-score", type=int, default=None,
+                        help="Exit with 1 if any app's overall score is below this")
+    parser.add_argument("--output", default="-", help="JSONL output file (default: stdout)")
+    parser.add_argument("--summary-only", action="store_true",
+                        help="Write only name and scores instead of full reports")
+    parser.add_argument("--sections", default=None,
+                        help="Only compute these sections, e.g. security,testability (default: all)")
+    return parser.parse_args(argv)
+
+
+def _summarize(line: Dict[str, Any]) -> Dict[str, Any]:
+    data = line["data"]
+    return {
+        "path": line["path"],
+        "success": True,
+        "appName": data["appName"],
+        "overallScore": data.get("overallScore"),
+        "categories": {name: category["score"] for name, category in data.get("categories", {}).items()},
+    }
+
+
+def _score(data: Dict[str, Any]) -> Optional[int]:
+    """Overall score, or the lowest category score of a partial analysis"""
+    if "overallScore" in data:
+        return data["overallScore"]
+    scores = [category["score"] for category in data.get("categories", {}).values()]
+    return min(scores) if scores else None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    sections = None
+    if args.sections:
+        from pipeline import parse_sections
+
+        try:
+            sections = parse_sections(args.sections)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return EXIT_INPUT_ERROR
+
+    paths = discover_inputs(args.inputs)
+    if not paths:
+        print("No config files found", file=sys.stderr)
+        return EXIT_INPUT_ERROR
+
+    exit_code = EXIT_OK
+    counts: Dict[str, int] = {"analyzed": 0, "failed": 0, "belowThreshold": 0}
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+
+    try:
+        for line in run(paths, args.workers, args.ai, sections):
+            if not line["success"]:
+                counts["failed"] += 1
+                exit_code = EXIT_INPUT_ERROR
+            else:
+                counts["analyzed"] += 1
+                score = _score(line["data"])
+                if args.min_score is not None and score is not None and score < args.min_score:
+                    counts["belowThreshold"] += 1
+                    exit_code = max(exit_code, EXIT_BELOW_THRESHOLD)
+                if args.summary_only:
+                    line = _summarize(line)
+
+            output.write(json.dumps(line) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(
+        f"{counts['analyzed']} analyzed, {counts['failed']} failed, "
+        f"{counts['belowThreshold']} below threshold",
+        file=sys.stderr,
+    )
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
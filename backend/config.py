@@ -1,7 +1,25 @@
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+
+def _find_env_file() -> str:
+    """Locate .env the way python-dotenv does, walking up from this file"""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        candidate = os.path.join(directory, ".env")
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return ""
+        directory = parent
+
+
+# python-dotenv is only imported when there is a .env file to load
+_env_file = _find_env_file()
+if _env_file:
+    from dotenv import load_dotenv
+
+    load_dotenv(_env_file)
 
 class Settings:
     """Application settings"""
@@ -14,7 +32,9 @@ class Settings:
     # OpenAI Settings
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
     OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None  # e.g. mock_openai.py for load tests
     OPENAI_TEMPERATURE = 0.7
+    OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))  # client retries per AI call (0 for load tests)
     
     # CORS Settings
     ALLOWED_ORIGINS = [
@@ -27,10 +47,33 @@ class Settings:
     # Analysis Settings
     MAX_ANALYSIS_TIME = 60  # seconds
     ANALYSIS_BATCH_SIZE = 5
+    # Oldest stored analyses are evicted beyond this; each takes ~3 KB, and
+    # bulk exports can only include what is still stored
+    MAX_STORED_ANALYSES = int(os.getenv("MAX_STORED_ANALYSES", "100000"))
+    RULES_VERSION = "1"  # bump when analysis rules change; tracked apps get re-analyzed
+
+    # Re-analysis Scheduler Settings
+    TRACKED_APPS_DIR = os.getenv("TRACKED_APPS_DIR", "")  # one JSON file per tracked app, kept across restarts
+    REANALYSIS_POLL_SECONDS = 1.0
+    REANALYSIS_MIN_INTERVAL = 2.0  # seconds between background re-analyses
+    REANALYSIS_IDLE_SECONDS = 1.0  # quiet time after the last API request before running
+    REANALYSIS_MAX_ATTEMPTS = 3
     
+    # Capacity Model Settings
+    CAPACITY_SCENARIOS = 2000  # Monte Carlo traffic scenarios per analysis
+    CAPACITY_LATENCY_SLO = 1.0  # seconds, p95 response time target
+
     # File Settings
-    MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+    MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB, also caps decompressed request bodies
+    EXPORT_CHUNK_SIZE = 64 * 1024  # bytes per streamed export chunk
     
+    # Profiling Settings (disabled unless an admin token is configured)
+    PROFILING_ADMIN_TOKEN = os.getenv("PROFILING_ADMIN_TOKEN", "")
+    PROFILING_MAX_PER_WINDOW = 10  # profiled analyses allowed per window
+    PROFILING_WINDOW_SECONDS = 3600
+    PROFILING_MAX_STORED = 20  # oldest profiles are dropped beyond this
+    PROFILING_TRACEBACK_FRAMES = 1  # tracemalloc frames kept per allocation
+
     # Scoring Settings
     SCORING_WEIGHTS = {
         "scalability": 0.25,
@@ -0,0 +1,258 @@
+import json
+import re
+import sys
+from array import array
+from collections import deque
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Lockfile file names recognised in ZIP bundles and lockfileName
+NPM_LOCKFILES = ("package-lock.json", "npm-shrinkwrap.json")
+PIP_LOCKFILES = ("requirements.txt",)
+LOCKFILE_NAMES = NPM_LOCKFILES + PIP_LOCKFILES
+
+REQUIREMENT_LINE = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(\[[^\]]*\])?\s*([^;#]*)")
+
+HOT_SPOT_COUNT = 5
+
+
+class DependencyStats(NamedTuple):
+    """Summary metrics of a dependency graph"""
+    totalPackages: int
+    directCount: int
+    maxDepth: int
+    duplicateVersions: Dict[str, Tuple[str, ...]]
+    fanInHotSpots: Tuple[Tuple[str, int], ...]
+
+
+class DependencyGraph:
+    """
+    Compact dependency graph
+
+    Nodes are (name, version) pairs with interned names; edges are kept as
+    CSR adjacency arrays (offsets + targets) of node ids.
+    """
+
+    def __init__(self):
+        self._ids: Dict[Tuple[str, str], int] = {}
+        self.names: List[str] = []
+        self.versions: List[str] = []
+        self.roots: List[int] = []
+        self._edges: List[Tuple[int, int]] = []
+        self.offsets = array("i")
+        self.targets = array("i")
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def node(self, name: str, version: str) -> int:
+        """Id of (name, version), adding the node if it is new"""
+        key = (sys.intern(name), sys.intern(version or ""))
+        node_id = self._ids.get(key)
+        if node_id is None:
+            node_id = len(self.names)
+            self._ids[key] = node_id
+            self.names.append(key[0])
+            self.versions.append(key[1])
+        return node_id
+
+    def add_edge(self, source: int, target: int) -> None:
+        self._edges.append((source, target))
+
+    def add_root(self, node_id: int) -> None:
+        self.roots.append(node_id)
+
+    def freeze(self) -> "DependencyGraph":
+        """Pack collected edges into CSR arrays"""
+        edges = sorted(set(self._edges))
+        self._edges = []
+
+        counts = [0] * (len(self.names) + 1)
+        for source, _ in edges:
+            counts[source + 1] += 1
+        for i in range(len(self.names)):
+            counts[i + 1] += counts[i]
+
+        self.offsets = array("i", counts)
+        self.targets = array("i", (target for _, target in edges))
+        self.roots = list(dict.fromkeys(self.roots))
+        return self
+
+    def direct_dependencies(self) -> Dict[str, str]:
+        """Root packages as a name -> version dict"""
+        return {self.names[node_id]: self.versions[node_id] for node_id in self.roots}
+
+    def stats(self) -> DependencyStats:
+        """Depth, duplicate versions, fan-in hot spots and package count"""
+        count = len(self.names)
+        offsets, targets = self.offsets, self.targets
+
+        # Depth: BFS from the direct dependencies (depth 1)
+        depth = array("i", [0]) * count
+        queue = deque()
+        for root in self.roots:
+            if not depth[root]:
+                depth[root] = 1
+                queue.append(root)
+        while queue:
+            node_id = queue.popleft()
+            next_depth = depth[node_id] + 1
+            for target in targets[offsets[node_id]:offsets[node_id + 1]]:
+                if not depth[target]:
+                    depth[target] = next_depth
+                    queue.append(target)
+
+        fan_in = array("i", [0]) * count
+        for target in targets:
+            fan_in[target] += 1
+
+        versions_by_name: Dict[str, List[str]] = {}
+        for name, version in zip(self.names, self.versions):
+            versions_by_name.setdefault(name, []).append(version)
+
+        hot_spots = sorted(range(count), key=fan_in.__getitem__, reverse=True)[:HOT_SPOT_COUNT]
+
+        return DependencyStats(
+            totalPackages=count,
+            directCount=len(self.roots),
+            maxDepth=max(depth, default=0),
+            duplicateVersions={
+                name: tuple(sorted(versions))
+                for name, versions in versions_by_name.items()
+                if len(versions) > 1
+            },
+            fanInHotSpots=tuple(
+                (self.names[node_id], fan_in[node_id]) for node_id in hot_spots if fan_in[node_id] > 0
+            ),
+        )
+
+
+def _npm_packages_graph(packages: Dict[str, Any], include_dev: bool) -> DependencyGraph:
+    """lockfileVersion 2/3: flat "packages" map keyed by node_modules path"""
+    graph = DependencyGraph()
+
+    def package_name(path: str, entry: Dict[str, Any]) -> str:
+        return entry.get("name") or path.rsplit("node_modules/", 1)[-1]
+
+    def resolve(from_path: str, name: str) -> Optional[str]:
+        # Node resolution: nearest node_modules up the tree
+        scope = from_path
+        while True:
+            candidate = f"{scope}/node_modules/{name}" if scope else f"node_modules/{name}"
+            if candidate in packages:
+                return candidate
+            if not scope:
+                return None
+            cut = scope.rfind("/node_modules/")
+            scope = scope[:cut] if cut >= 0 else ""
+
+    # Dev-only entries are left out like in v1 locks, so edges into or out
+    # of them are dropped below. devOptional entries stay: npm installs them
+    # as optional dependencies of production packages.
+    node_ids: Dict[str, int] = {}
+    for path, entry in packages.items():
+        if path and not entry.get("link") and (include_dev or not entry.get("dev")):
+            node_ids[path] = graph.node(package_name(path, entry), entry.get("version", ""))
+
+    for path, entry in packages.items():
+        dependency_names = list(entry.get("dependencies") or ())
+        dependency_names += list(entry.get("optionalDependencies") or ())
+        if not path and include_dev:
+            dependency_names += list(entry.get("devDependencies") or ())
+
+        for name in dependency_names:
+            resolved = resolve(path, name)
+            if resolved is None or resolved not in node_ids:
+                continue
+            if path:
+                if path in node_ids:
+                    graph.add_edge(node_ids[path], node_ids[resolved])
+            else:
+                graph.add_root(node_ids[resolved])
+
+    return graph.freeze()
+
+
+def _npm_nested_graph(lock: Dict[str, Any], include_dev: bool) -> DependencyGraph:
+    """
+    lockfileVersion 1: nested "dependencies" with "requires" ranges
+
+    v1 locks don't record the root's own dependency list, so every
+    top-level (hoisted) entry is treated as direct.
+    """
+    graph = DependencyGraph()
+    pending: List[Tuple[int, List[str], Tuple[Dict[str, Any], ...]]] = []
+
+    def visit(dependencies: Dict[str, Any], scopes: Tuple[Dict[str, Any], ...], is_root: bool) -> None:
+        scopes = (dependencies,) + scopes
+        for name, entry in dependencies.items():
+            if is_root and entry.get("dev") and not include_dev:
+                continue
+            node_id = graph.node(name, entry.get("version", ""))
+            if is_root:
+                graph.add_root(node_id)
+            nested = entry.get("dependencies") or {}
+            pending.append((node_id, list(entry.get("requires") or ()), (nested,) + scopes))
+            if nested:
+                visit(nested, scopes, False)
+
+    visit(lock.get("dependencies") or {}, (), True)
+
+    for node_id, required, scopes in pending:
+        for name in required:
+            for scope in scopes:
+                if name in scope:
+                    graph.add_edge(node_id, graph.node(name, scope[name].get("version", "")))
+                    break
+
+    return graph.freeze()
+
+
+def parse_package_lock(content: str, include_dev: bool = False) -> DependencyGraph:
+    """
+    Build a dependency graph from package-lock.json / npm-shrinkwrap.json
+
+    Args:
+        content: Lockfile text
+        include_dev: Also include dev-only packages (the root's devDependencies
+            and everything only they pull in)
+    """
+    lock = json.loads(content)
+    if "packages" in lock:
+        return _npm_packages_graph(lock["packages"], include_dev)
+    return _npm_nested_graph(lock, include_dev)
+
+
+def parse_requirements(lines: Iterable[str]) -> DependencyGraph:
+    """
+    Build a (flat) dependency graph from requirements.txt lines
+
+    Pip requirement files carry no edges, so every entry is a direct
+    dependency at depth 1. Options (-r, -e, --hash ...) are skipped.
+    """
+    graph = DependencyGraph()
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(("#", "-")):
+            continue
+        match = REQUIREMENT_LINE.match(line)
+        if match:
+            name = match.group(1).lower().replace("_", "-")
+            version = match.group(3).strip().lstrip("=").strip()
+            graph.add_root(graph.node(name, version))
+    return graph.freeze()
+
+
+def parse_lockfile(content: str, filename: Optional[str] = None) -> DependencyGraph:
+    """
+    Parse a lockfile, detecting its type from the file name or content
+
+    Args:
+        content: Lockfile text
+        filename: Original file name, e.g. package-lock.json or requirements.txt
+    """
+    basename = (filename or "").replace("\\", "/").rsplit("/", 1)[-1].lower()
+    if basename in NPM_LOCKFILES or (not basename and content.lstrip().startswith("{")):
+        return parse_package_lock(content)
+    if basename in PIP_LOCKFILES or basename.endswith(".txt") or not basename:
+        return parse_requirements(content.splitlines())
+    raise ValueError(f"Unsupported lockfile: {filename}")
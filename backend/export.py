@@ -0,0 +1,175 @@
+import csv
+import io
+import json
+import re
+import zipfile
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from records import AnalysisResult
+from scoring import CATEGORY_ORDER
+
+EXPORT_FORMATS = {
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "csv": ("text/csv", "csv"),
+    "zip": ("application/zip", "zip"),
+}
+
+CSV_COLUMNS = (
+    ["analysisId", "appName", "timestamp", "overallScore"]
+    + [f"{name}{suffix}" for name in CATEGORY_ORDER for suffix in ("Score", "Level")]
+    + ["riskCount", "criticalRisks", "highRisks", "readinessLevel", "recommendationCount"]
+)
+
+
+def parse_bound(value: Optional[str], end_of_day: bool = False) -> Optional[datetime]:
+    """
+    Parse a date or datetime filter bound
+
+    Args:
+        value: ISO date (2024-01-31) or datetime (2024-01-31T12:00:00)
+        end_of_day: Extend a bare date to the end of that day (for upper bounds)
+    """
+    if not value:
+        return None
+
+    bound = datetime.fromisoformat(value)
+    if bound.tzinfo is not None:
+        # Stored timestamps are naive local time
+        bound = bound.astimezone().replace(tzinfo=None)
+    if end_of_day and "T" not in value and " " not in value:
+        bound += timedelta(days=1, microseconds=-1)
+    return bound
+
+
+def filter_analyses(
+    analyses: Iterable[Tuple[str, AnalysisResult]],
+    app_name: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> Iterator[Tuple[str, AnalysisResult]]:
+    """
+    Lazily select stored analyses
+
+    Args:
+        analyses: (analysis_id, result) pairs
+        app_name: Case-insensitive substring of the app name
+        since: Earliest timestamp (inclusive)
+        until: Latest timestamp (inclusive)
+    """
+    needle = app_name.lower() if app_name else None
+    for analysis_id, result in analyses:
+        if needle and needle not in result.appName.lower():
+            continue
+        if since or until:
+            timestamp = datetime.fromisoformat(result.timestamp)
+            if since and timestamp < since:
+                continue
+            if until and timestamp > until:
+                continue
+        yield analysis_id, result
+
+
+def _report(analysis_id: str, result: AnalysisResult) -> Dict[str, Any]:
+    """Full JSON report of one analysis"""
+    return {"analysisId": analysis_id, **result.to_model().dict()}
+
+
+def _chunked(pieces: Iterable[bytes], chunk_size: int) -> Iterator[bytes]:
+    """Coalesce small pieces into chunks of roughly chunk_size bytes"""
+    buffer: List[bytes] = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def stream_jsonl(analyses: Iterable[Tuple[str, AnalysisResult]], chunk_size: int) -> Iterator[bytes]:
+    """One JSON report per line"""
+    return _chunked(
+        (json.dumps(_report(analysis_id, result)).encode() + b"\n" for analysis_id, result in analyses),
+        chunk_size,
+    )
+
+
+def _csv_row(analysis_id: str, result: AnalysisResult) -> List[Any]:
+    """Flatten one analysis into a CSV row"""
+    row: List[Any] = [analysis_id, result.appName, result.timestamp, result.overallScore]
+    for name in CATEGORY_ORDER:
+        category = result.categories.get(name)
+        row += [category.score, category.level] if category else ["", ""]
+
+    severities = [risk.severity for risk in result.risks]
+    row += [
+        len(result.risks),
+        severities.count("Critical"),
+        severities.count("High"),
+        result.scaleAnalysis.readinessLevel,
+        len(result.recommendations),
+    ]
+    return row
+
+
+def stream_csv(analyses: Iterable[Tuple[str, AnalysisResult]], chunk_size: int) -> Iterator[bytes]:
+    """Header plus one flattened row per analysis"""
+    def rows() -> Iterator[bytes]:
+        line = io.StringIO()
+        writer = csv.writer(line)
+        writer.writerow(CSV_COLUMNS)
+        for analysis_id, result in analyses:
+            writer.writerow(_csv_row(analysis_id, result))
+            yield line.getvalue().encode()
+            line.seek(0)
+            line.truncate()
+        yield line.getvalue().encode()
+
+    return _chunked(rows(), chunk_size)
+
+
+class _ZipSink(io.RawIOBase):
+    """Write-only, unseekable sink that lets ZipFile stream its output"""
+
+    def __init__(self):
+        self.pieces: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.pieces.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self.pieces)
+        self.pieces = []
+        return data
+
+
+def _safe_filename(name: str) -> str:
+    """Filesystem-friendly version of an app name"""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("_")[:80] or "app"
+
+
+def stream_zip(analyses: Iterable[Tuple[str, AnalysisResult]], chunk_size: int) -> Iterator[bytes]:
+    """ZIP archive with one JSON report per analysis, emitted as each entry is written"""
+    def pieces() -> Iterator[bytes]:
+        sink = _ZipSink()
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for analysis_id, result in analyses:
+                filename = f"{analysis_id}_{_safe_filename(result.appName)}.json"
+                archive.writestr(filename, json.dumps(_report(analysis_id, result), indent=2))
+                yield sink.drain()
+        yield sink.drain()
+
+    return _chunked(pieces(), chunk_size)
+
+
+STREAMERS = {
+    "jsonl": stream_jsonl,
+    "csv": stream_csv,
+    "zip": stream_zip,
+}
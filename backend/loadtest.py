@@ -0,0 +1,234 @@
+"""
+Load-test harness for the ProdLens API
+
+Drives /api/analyze with synthetic app configs at a fixed concurrency
+(closed loop) or a Poisson arrival rate (open loop), then reports
+throughput, latency percentiles and an error breakdown.
+
+    python loadtest.py --concurrency 32 --duration 60
+    python loadtest.py --rate 50 --concurrency 200 --requests 5000 --json
+
+Pair with mock_openai.py to exercise the AI path without an OpenAI key.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+import httpx
+
+DEPENDENCY_POOL = {
+    "react": "^18.2.0",
+    "react-dom": "^18.2.0",
+    "axios": "^1.4.0",
+    "lodash": "^4.17.21",
+    "moment": "^2.29.4",
+    "redis": "^4.6.0",
+    "bull-queue": "^4.10.0",
+    "async": "^3.2.4",
+    "jest": "^29.0.0",
+    "vite": "^4.4.0",
+    "webpack": "^5.88.0",
+    "next-auth": "^4.22.0",
+    "express": "^4.18.2",
+    "sync-request": "^6.1.0",
+}
+
+COMPONENT_TYPES = ["header", "sidebar", "container", "dashboard", "reports", "form", "table", "chart"]
+
+
+def generate_app_config(rng: random.Random, index: int) -> Dict[str, Any]:
+    """Build a random but well-formed app config"""
+    dependencies = dict(rng.sample(sorted(DEPENDENCY_POOL.items()), rng.randint(0, 10)))
+    components = [
+        {"id": f"component-{i}", "type": rng.choice(COMPONENT_TYPES)}
+        for i in range(rng.randint(0, 40))
+    ]
+
+    return {
+        "name": f"Load Test App {index}",
+        "description": "Synthetic application generated by the ProdLens load-test harness" if rng.random() < 0.7 else "",
+        "blocks": {"layout": {"type": "grid", "columns": 12}, "components": components},
+        "dependencies": dependencies,
+        "metadata": {
+            "version": "1.0.0",
+            "complexity": rng.choice(["low", "medium", "high"]),
+            "estimatedUsers": rng.choice([100, 1000, 5000, 20000, 100000]),
+        },
+    }
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class LoadTest:
+    """One load-test run and its collected samples"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.latencies: List[float] = []
+        self.errors: Counter = Counter()
+        self.sent = 0
+        self.started = 0.0
+        self.finished = 0.0
+
+    def _has_budget(self) -> bool:
+        """Whether another request may be started"""
+        if self.args.requests and self.sent >= self.args.requests:
+            return False
+        return time.perf_counter() - self.started < self.args.duration
+
+    async def _send(self, client: httpx.AsyncClient) -> None:
+        """Issue one analysis request and record the outcome"""
+        index = self.sent
+        self.sent += 1
+        config = generate_app_config(self.rng, index)
+        payload = {"appConfig": config, "appName": config["name"]}
+
+        start = time.perf_counter()
+        try:
+            response = await client.post(self.args.endpoint, json=payload)
+        except httpx.TimeoutException:
+            self.errors["timeout"] += 1
+            return
+        except httpx.HTTPError as e:
+            self.errors[f"transport:{type(e).__name__}"] += 1
+            return
+        elapsed = time.perf_counter() - start
+
+        if response.status_code != 200:
+            self.errors[f"http:{response.status_code}"] += 1
+            return
+
+        body = response.json()
+        if not body.get("success"):
+            self.errors[f"api:{(body.get('error') or 'unknown')[:60]}"] += 1
+            return
+
+        # The API answers failed AI calls with defaults; count those as errors
+        ai_fallbacks = (body.get("data") or {}).get("aiFallbacks")
+        if ai_fallbacks:
+            self.errors[f"ai_fallback:{','.join(sorted(ai_fallbacks))}"] += 1
+            return
+
+        self.latencies.append(elapsed)
+
+    async def _closed_loop_worker(self, client: httpx.AsyncClient) -> None:
+        """Send requests back to back until the budget runs out"""
+        while self._has_budget():
+            await self._send(client)
+
+    async def _open_loop(self, client: httpx.AsyncClient) -> None:
+        """Start requests on Poisson arrivals, capped at the concurrency limit"""
+        semaphore = asyncio.Semaphore(self.args.concurrency)
+        tasks = set()
+
+        async def guarded() -> None:
+            async with semaphore:
+                await self._send(client)
+
+        next_arrival = time.perf_counter()
+        while self._has_budget():
+            if semaphore.locked():
+                self.errors["dropped:concurrency_limit"] += 1
+                self.sent += 1
+            else:
+                task = asyncio.create_task(guarded())
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            next_arrival += self.rng.expovariate(self.args.rate)
+            await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def run(self) -> Dict[str, Any]:
+        """Run the test and return the report"""
+        limits = httpx.Limits(max_connections=self.args.concurrency, max_keepalive_connections=self.args.concurrency)
+        async with httpx.AsyncClient(base_url=self.args.url, timeout=self.args.timeout, limits=limits) as client:
+            self.started = time.perf_counter()
+            if self.args.rate:
+                await self._open_loop(client)
+            else:
+                await asyncio.gather(*(self._closed_loop_worker(client) for _ in range(self.args.concurrency)))
+            self.finished = time.perf_counter()
+
+        return self.report()
+
+    def report(self) -> Dict[str, Any]:
+        """Summarize collected samples"""
+        elapsed = max(self.finished - self.started, 1e-9)
+        latencies = sorted(self.latencies)
+        error_count = sum(self.errors.values())
+
+        return {
+            "mode": f"open loop @ {self.args.rate}/s" if self.args.rate else "closed loop",
+            "concurrency": self.args.concurrency,
+            "durationSeconds": round(elapsed, 3),
+            "requests": self.sent,
+            "succeeded": len(latencies),
+            "failed": error_count,
+            "throughputPerSecond": round(len(latencies) / elapsed, 2),
+            "latencyMs": {
+                "mean": round(1000 * sum(latencies) / len(latencies), 2) if latencies else 0.0,
+                "p50": round(1000 * percentile(latencies, 50), 2),
+                "p95": round(1000 * percentile(latencies, 95), 2),
+                "p99": round(1000 * percentile(latencies, 99), 2),
+                "max": round(1000 * latencies[-1], 2) if latencies else 0.0,
+            },
+            "errors": dict(self.errors.most_common()),
+        }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Human-readable report"""
+    latency = report["latencyMs"]
+    print(f"Mode:        {report['mode']}, concurrency {report['concurrency']}")
+    print(f"Duration:    {report['durationSeconds']}s")
+    print(f"Requests:    {report['requests']} ({report['succeeded']} ok, {report['failed']} failed)")
+    print(f"Throughput:  {report['throughputPerSecond']} req/s")
+    print(f"Latency ms:  mean {latency['mean']}  p50 {latency['p50']}  p95 {latency['p95']}  "
+          f"p99 {latency['p99']}  max {latency['max']}")
+    if report["errors"]:
+        print("Errors:")
+        for kind, count in report["errors"].items():
+            print(f"  {count:>8}  {kind}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load-test the ProdLens analysis API")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="API base URL")
+    parser.add_argument("--endpoint", default="/api/analyze")
+    parser.add_argument("--concurrency", type=int, default=10, help="Max requests in flight")
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="Mean arrivals per second (Poisson); 0 runs a closed loop")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate load")
+    parser.add_argument("--requests", type=int, default=0, help="Stop after this many requests (0 = no limit)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for synthetic configs and arrivals")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = asyncio.run(LoadTest(args).run())
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    sys.exit(1 if report["succeeded"] == 0 else 0)
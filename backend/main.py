@@ -1,27 +1,46 @@
 import asyncio
+import importlib
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Dict, Any, List
-from fastapi import FastAPI, HTTPException
+from typing import Dict, Any, List, Optional
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from models import (
     AnalysisRequestModel,
-    AnalysisResultModel,
     APIResponseModel,
-    CategoryScoreModel,
-    RiskModel,
-    TestSuggestionModel,
-    ScaleAnalysisModel,
-    RecommendationModel,
+    WeightSimulationRequestModel,
 )
-from analysis_engine import RuleBasedAnalyzer
-from ai_analyzer import AIAnalyzer
+from records import AnalysisResult
+from pipeline import ai_analyzer, analyze_sections, parse_sections, perform_analysis
+from scoring import ScoreMatrix
+from request_body import openapi_body, parse_body
+from export import EXPORT_FORMATS, STREAMERS, filter_analyses, parse_bound
+from profiling import PROFILE_HEADER, ProfileStore
+from reanalysis import ActivityMiddleware, ReanalysisScheduler
 from config import settings
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the background re-analysis scheduler while the app is up"""
+    # Import numpy (score matrix, capacity model) and openai on worker
+    # threads now rather than on the event loop during the first requests;
+    # startup doesn't wait for them
+    loop = asyncio.get_running_loop()
+    loop.run_in_executor(None, importlib.import_module, "numpy")
+    if ai_analyzer.is_available():
+        loop.run_in_executor(None, ai_analyzer.warm_up)
+    scheduler.start()
+    yield
+    await scheduler.stop()
+
+
 # Initialize FastAPI
 app = FastAPI(
     title=settings.API_TITLE,
     description=settings.API_DESCRIPTION,
     version=settings.API_VERSION,
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -33,13 +52,53 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize AI Analyzer
-ai_analyzer = AIAnalyzer()
-
-# In-memory storage for analysis results (for demo/MVP)
-analysis_cache: Dict[str, AnalysisResultModel] = {}
+# In-memory storage for analysis results (for demo/MVP), capped at MAX_STORED_ANALYSES
+# Results are kept as compact records and converted to API models on the way out
+analysis_cache: Dict[str, AnalysisResult] = {}
 analysis_counter = 0
 
+# Category scores of stored analyses, for what-if weight simulation
+score_matrix = ScoreMatrix()
+
+# Opt-in per-request profiles, downloadable from /api/diagnostics
+profile_store = ProfileStore()
+
+
+def store_analysis(result: AnalysisResult, analysis_id: Optional[str] = None) -> str:
+    """
+    Store an analysis result and index its category scores
+    
+    Args:
+        result: Completed analysis result
+        analysis_id: Existing analysis to replace (e.g. a tracked app's refresh)
+        
+    Returns:
+        Analysis identifier
+    """
+    global analysis_counter
+    if analysis_id is None:
+        analysis_counter += 1
+        analysis_id = f"analysis_{analysis_counter}"
+
+    # A replaced result moves to the end, so eviction order follows the
+    # last time each analysis was stored
+    analysis_cache.pop(analysis_id, None)
+    analysis_cache[analysis_id] = result
+    score_matrix.add(analysis_id, result.appName, result.categories)
+
+    # Bounded store: evict the least recently stored analyses first
+    while len(analysis_cache) > settings.MAX_STORED_ANALYSES:
+        oldest = next(iter(analysis_cache))
+        del analysis_cache[oldest]
+        score_matrix.remove(oldest)
+
+    return analysis_id
+
+
+# Tracked apps, re-analyzed in the background when rules, weights or model change
+scheduler = ReanalysisScheduler(store_analysis)
+app.add_middleware(ActivityMiddleware, activity=scheduler.activity)
+
 
 @app.get("/api/health", tags=["Health"])
 async def health_check():
@@ -55,28 +114,89 @@ async def health_check():
     )
 
 
-@app.post("/api/analyze", response_model=APIResponseModel, tags=["Analysis"])
-async def analyze_app(request: AnalysisRequestModel):
+async def analysis_request_body(request: Request) -> AnalysisRequestModel:
+    """Analysis request from a JSON or MessagePack body, optionally gzip/zstd encoded"""
+    return await parse_body(request, AnalysisRequestModel)
+
+
+@app.post(
+    "/api/analyze",
+    response_model=APIResponseModel,
+    tags=["Analysis"],
+    openapi_extra=openapi_body(AnalysisRequestModel),
+)
+async def analyze_app(
+    request: AnalysisRequestModel = Depends(analysis_request_body),
+    sections: Optional[str] = None,
+    ai: bool = True,
+    profile: bool = False,
+    profile_token: Optional[str] = Header(None, alias=PROFILE_HEADER),
+):
     """
     Analyze application configuration
     
     Args:
-        request: Analysis request with app config
+        request: Analysis request with app config (JSON or MessagePack,
+            optionally gzip/zstd compressed)
+        sections: Comma-separated sections to compute, e.g. "security,risks"
+            (default: full analysis). Partial results are not stored.
+        ai: Allow LLM calls
+        profile: Profile this analysis (?profile=1); needs the admin token
+        profile_token: Admin token from the X-ProdLens-Profile header (never
+            taken from the query string, which ends up in access logs)
         
     Returns:
-        Analysis result with scores and recommendations
+        Analysis result with scores and recommendations; "aiFallbacks"
+        lists AI sections that failed and were filled with defaults
     """
+    if profile:
+        # 403 like the diagnostics endpoints, raised outside the try below
+        require_admin(profile_token)
+
     try:
-        app_config = request.appConfig.dict()
+        app_config = request.appConfig.dict(exclude_none=True)
         app_name = request.appName or "Untitled App"
-
-        # Run analysis
-        result = await perform_analysis(app_config, app_name)
+        message = "Analysis completed successfully"
+        extra: Dict[str, Any] = {}
+        ai_fallbacks: List[str] = []
+
+        section_names = parse_sections(sections)
+        if section_names is None:
+            analyze = lambda serial=False: perform_analysis(
+                app_config, app_name, use_ai=ai, serial=serial, ai_fallbacks=ai_fallbacks
+            )
+        else:
+            analyze = lambda serial=False: analyze_sections(
+                app_config, app_name, section_names, use_ai=ai, serial=serial, ai_fallbacks=ai_fallbacks
+            )
+
+        # Run analysis (profiled only on explicit admin request)
+        if not profile:
+            result = await analyze()
+        else:
+            result, profile_id, skipped = await profile_store.run(app_name, analyze)
+            if profile_id:
+                extra["profileId"] = profile_id
+            else:
+                message += f" (not profiled: {skipped})"
+
+        # AI sections that failed and were answered with defaults
+        if ai_fallbacks:
+            extra["aiFallbacks"] = ai_fallbacks
+
+        if section_names is not None:
+            return APIResponseModel(
+                success=True,
+                message=message,
+                data={**result, **extra}
+            )
+
+        analysis_id = store_analysis(result)
 
         return APIResponseModel(
             success=True,
-            message="Analysis completed successfully",
-            data=result.dict()
+            message=message,
+            data={**result.to_model().dict(), "analysisId": analysis_id, **extra}
         )
 
     except Exception as e:
@@ -131,7 +251,7 @@ async def get_sample_analysis():
         return APIResponseModel(
             success=True,
             message="Sample analysis generated",
-            data=result.dict()
+            data=result.to_model().dict()
         )
 
     except Exception as e:
@@ -168,119 +288,240 @@ async def get_analysis_status(analysis_id: str):
     )
 
 
-async def perform_analysis(app_config: Dict[str, Any], app_name: str) -> AnalysisResultModel:
+@app.post("/api/scoring/simulate", response_model=APIResponseModel, tags=["Scoring"])
+async def simulate_scoring_weights(request: WeightSimulationRequestModel):
     """
-    Perform complete analysis on app configuration
+    Recompute overall scores and rankings of all stored analyses under
+    candidate scoring weights, without re-running any analysis
     
     Args:
-        app_config: Application configuration
-        app_name: Application name
+        request: One or many candidate weight vectors
         
     Returns:
-        Complete analysis result
+        Baseline and per-policy rankings with rank changes
     """
+    try:
+        simulation = score_matrix.simulate(request.weights, request.baseline)
+
+        return APIResponseModel(
+            success=True,
+            message=f"Simulated {len(request.weights)} weighting policies over {simulation['analysisCount']} analyses",
+            data=simulation
+        )
+
+    except Exception as e:
+        return APIResponseModel(
+            success=False,
+            error=str(e)
+        )
+
 
-    # Run rule-based analysis
-    scalability = RuleBasedAnalyzer.analyze_scalability(app_config)
-    security = RuleBasedAnalyzer.analyze_security(app_config)
-    testability = RuleBasedAnalyzer.analyze_testability(app_config)
-    maintainability = RuleBasedAnalyzer.analyze_maintainability(app_config)
-    performance = RuleBasedAnalyzer.analyze_performance(app_config)
-
-    # Calculate overall score
-    weights = settings.SCORING_WEIGHTS
-    overall_score = int(
-        scalability.score * weights["scalability"] +
-        security.score * weights["security"] +
-        testability.score * weights["testability"] +
-        maintainability.score * weights["maintainability"] +
-        performance.score * weights["performance"]
+@app.get("/api/export", tags=["Export"])
+async def export_analyses(
+    format: str = "jsonl",
+    appName: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+):
+    """
+    Stream stored analyses as JSON Lines, flattened CSV or a ZIP of reports
+    
+    Args:
+        format: jsonl, csv or zip
+        appName: Case-insensitive substring of the app name
+        since: Earliest analysis timestamp (inclusive)
+        until: Latest analysis timestamp (inclusive)
+        
+    Returns:
+        Streaming download, written chunk by chunk from the store
+    """
+    if format not in EXPORT_FORMATS:
+        return APIResponseModel(
+            success=False,
+            error=f"Unsupported export format '{format}'. Use one of: {', '.join(EXPORT_FORMATS)}"
+        )
+
+    try:
+        since_bound = parse_bound(since)
+        until_bound = parse_bound(until, end_of_day=True)
+    except ValueError as e:
+        return APIResponseModel(
+            success=False,
+            error=f"Invalid date filter: {e}"
+        )
+
+    # Snapshot references only, so analyses stored mid-export don't break iteration
+    analyses = filter_analyses(list(analysis_cache.items()), appName, since_bound, until_bound)
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = f"prodlens-export-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{extension}"
+
+    return StreamingResponse(
+        STREAMERS[format](analyses, settings.EXPORT_CHUNK_SIZE),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
-    # Get rule-based risks and insights
-    risks = RuleBasedAnalyzer.generate_risks(app_config)
-    insights = RuleBasedAnalyzer.generate_insights(app_config)
 
-    # Get test suggestions (try AI first, fallback to default)
-    test_suggestions = []
-    if ai_analyzer.is_available():
-        ai_response = await ai_analyzer.analyze_with_ai(app_config, "testStrategy")
-        if ai_response:
-            parsed = AIAnalyzer.parse_json_response(ai_response)
-            if "suggestions" in parsed:
-                for sugg in parsed["suggestions"][:5]:
-                    test_suggestions.append(TestSuggestionModel(**sugg))
-
-    if not test_suggestions:
-        for sugg in AIAnalyzer.generate_test_suggestions_default()[:5]:
-            test_suggestions.append(TestSuggestionModel(**sugg))
-
-    # Get scale analysis
-    scale_analysis_dict = AIAnalyzer.generate_scale_analysis_default()
-    scale_analysis = ScaleAnalysisModel(**scale_analysis_dict)
-
-    # Generate recommendations (try AI first, fallback to rule-based)
-    recommendations = []
-    if ai_analyzer.is_available():
-        ai_response = await ai_analyzer.analyze_with_ai(app_config, "recommendations")
-        if ai_response:
-            parsed = AIAnalyzer.parse_json_response(ai_response)
-            if "recommendations" in parsed:
-                for rec in parsed["recommendations"][:6]:
-                    recommendations.append(RecommendationModel(**rec))
-
-    if not recommendations:
-        recommendations = [
-            RecommendationModel(
-                priority="High",
-                category="Security",
-                action="Implement Authentication",
-                rationale="Critical security requirement",
-                estimatedEffort="3-5 days"
-            ),
-            RecommendationModel(
-                priority="High",
-                category="Performance",
-                action="Add Caching Layer",
-                rationale="Improves response times under load",
-                estimatedEffort="2-3 days"
-            ),
-            RecommendationModel(
-                priority="Medium",
-                category="Testing",
-                action="Setup Test Framework",
-                rationale="Ensures code quality",
-                estimatedEffort="2 days"
-            ),
-            RecommendationModel(
-                priority="Medium",
-                category="Architecture",
-                action="Refactor to Microservices",
-                rationale="Better scalability and maintainability",
-                estimatedEffort="2-3 weeks"
-            ),
-        ]
-
-    # Create result
-    result = AnalysisResultModel(
-        appName=app_name,
-        timestamp=datetime.now().isoformat(),
-        overallScore=overall_score,
-        categories={
-            "scalability": scalability,
-            "security": security,
-            "testability": testability,
-            "maintainability": maintainability,
-            "performance": performance,
-        },
-        risks=risks,
-        insights=insights,
-        testSuggestions=test_suggestions,
-        scaleAnalysis=scale_analysis,
-        recommendations=recommendations,
+def require_admin(token: Optional[str] = Header(None, alias=PROFILE_HEADER)) -> None:
+    """Diagnostics endpoints need the profiling admin token"""
+    if not ProfileStore.is_authorized(token):
+        raise HTTPException(status_code=403, detail="Profiling is disabled or the admin token is invalid")
+
+
+@app.get("/api/diagnostics/profiles", tags=["Diagnostics"], dependencies=[Depends(require_admin)])
+async def list_profiles():
+    """
+    List captured analysis profiles, newest first
+    
+    Returns:
+        Profile summaries (duration, memory peak, top allocation sites)
+    """
+    return APIResponseModel(
+        success=True,
+        data={"profiles": profile_store.list()}
+    )
+
+
+@app.get("/api/diagnostics/profiles/{profile_id}", tags=["Diagnostics"], dependencies=[Depends(require_admin)])
+async def get_profile(profile_id: str, format: str = "json", limit: int = 30):
+    """
+    Get or download a captured profile
+    
+    Args:
+        profile_id: Profile identifier returned by /api/analyze
+        format: json (summary and text report), text, or pstats (binary
+            file for pstats / snakeviz)
+        limit: Functions listed in the text report
+        
+    Returns:
+        Profile summary or download
+    """
+    record = profile_store.get(profile_id)
+    if record is None:
+        return APIResponseModel(
+            success=False,
+            error="Profile not found"
+        )
+
+    if format == "pstats":
+        return Response(
+            record.stats,
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.prof"'},
+        )
+    if format == "text":
+        return Response(record.report(limit), media_type="text/plain")
+    if format != "json":
+        return APIResponseModel(
+            success=False,
+            error=f"Unsupported profile format '{format}'. Use one of: json, text, pstats"
+        )
+
+    return APIResponseModel(
+        success=True,
+        data={**record.summary(), "report": record.report(limit)}
     )
 
-    return result
+
+@app.post("/api/tracked-apps", response_model=APIResponseModel, tags=["Tracked Apps"])
+async def track_app(request: AnalysisRequestModel = Depends(analysis_request_body), ai: bool = True):
+    """
+    Register an app config for background re-analysis
+    
+    The app is analyzed right away; afterwards its result is refreshed
+    in the background whenever the rules version, scoring weights or LLM
+    model change.
+    
+    Args:
+        request: Analysis request with app config
+        ai: Allow LLM calls for this app
+        
+    Returns:
+        First analysis result with trackedId and analysisId
+    """
+    try:
+        app_config = request.appConfig.dict(exclude_none=True)
+        tracked = await scheduler.register(request.appName or "Untitled App", app_config, use_ai=ai)
+
+        return APIResponseModel(
+            success=True,
+            message="App registered for background re-analysis",
+            data={
+                **tracked.result.to_model().dict(),
+                "analysisId": tracked.analysisId,
+                "trackedId": tracked.trackedId,
+            }
+        )
+
+    except Exception as e:
+        return APIResponseModel(
+            success=False,
+            error=str(e)
+        )
+
+
+@app.get("/api/tracked-apps", tags=["Tracked Apps"])
+async def list_tracked_apps():
+    """
+    List tracked apps with their freshness and the scheduler state
+    
+    Returns:
+        Scheduler status and one summary per tracked app
+    """
+    return APIResponseModel(
+        success=True,
+        data={
+            "scheduler": scheduler.status(),
+            "apps": [tracked.summary() for tracked in scheduler.apps.values()],
+        }
+    )
+
+
+@app.get("/api/tracked-apps/{tracked_id}", tags=["Tracked Apps"])
+async def get_tracked_app(tracked_id: str):
+    """
+    Get the latest result of a tracked app
+    
+    Args:
+        tracked_id: Tracked app identifier
+        
+    Returns:
+        Latest analysis result with its freshness
+    """
+    tracked = scheduler.apps.get(tracked_id)
+    if tracked is None:
+        return APIResponseModel(
+            success=False,
+            error="Tracked app not found"
+        )
+
+    return APIResponseModel(
+        success=True,
+        data={
+            **tracked.summary(),
+            "result": tracked.result.to_model().dict() if tracked.result else None,
+        }
+    )
+
+
+@app.delete("/api/tracked-apps/{tracked_id}", tags=["Tracked Apps"])
+async def untrack_app(tracked_id: str):
+    """
+    Stop re-analyzing a tracked app (its stored analysis is kept)
+    
+    Args:
+        tracked_id: Tracked app identifier
+    """
+    if not await scheduler.unregister(tracked_id):
+        return APIResponseModel(
+            success=False,
+            error="Tracked app not found"
+        )
+
+    return APIResponseModel(
+        success=True,
+        message="App no longer tracked"
+    )
 
 
 @app.get("/", tags=["Root"])
@@ -0,0 +1,159 @@
+"""
+Local stand-in for the OpenAI chat-completions API
+
+Lets AIAnalyzer run offline for load testing. Point the backend at it with:
+
+    OPENAI_API_KEY=mock OPENAI_BASE_URL=http://127.0.0.1:8100/v1 python main.py
+
+Latency is drawn per request from a configurable distribution, and a
+configurable share of requests fail with server or rate-limit errors.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from typing import Any, Dict, Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from ai_analyzer import AIAnalyzer
+
+
+class MockSettings:
+    """Mock server behaviour, set from the command line"""
+
+    # Latency spec "<distribution>:<params...>" in seconds, e.g. "lognormal:0.8:0.4"
+    LATENCY = "lognormal:0.8:0.4"
+    ERROR_RATE = 0.0  # share of requests answered with 500
+    RATE_LIMIT_RATE = 0.0  # share of requests answered with 429
+    SEED: Optional[int] = None
+
+
+mock_settings = MockSettings()
+rng = random.Random()
+
+app = FastAPI(title="ProdLens Mock OpenAI API")
+
+
+def sample_latency(spec: str) -> float:
+    """
+    Draw one latency sample in seconds
+
+    Supported specs:
+        fixed:<s>, uniform:<low>:<high>, normal:<mean>:<stddev>,
+        exponential:<mean>, lognormal:<median>:<sigma>
+    """
+    name, *params = spec.split(":")
+    values = [float(p) for p in params]
+
+    if name == "fixed":
+        delay = values[0]
+    elif name == "uniform":
+        delay = rng.uniform(values[0], values[1])
+    elif name == "normal":
+        delay = rng.gauss(values[0], values[1])
+    elif name == "exponential":
+        delay = rng.expovariate(1.0 / values[0])
+    elif name == "lognormal":
+        delay = values[0] * rng.lognormvariate(0.0, values[1])
+    else:
+        raise ValueError(f"Unknown latency distribution: {name}")
+
+    return max(0.0, delay)
+
+
+def build_content(prompt: str) -> str:
+    """Return a JSON answer shaped like the one the prompt asks for"""
+    if '"suggestions"' in prompt:
+        return json.dumps({"suggestions": AIAnalyzer.generate_test_suggestions_default()})
+
+    if '"recommendations"' in prompt:
+        return json.dumps({
+            "recommendations": [
+                {
+                    "priority": "High",
+                    "category": "Security",
+                    "action": "Implement Authentication",
+                    "rationale": "Mock recommendation",
+                    "estimatedEffort": "3-5 days"
+                }
+            ]
+        })
+
+    if '"risks"' in prompt:
+        return json.dumps({"risks": []})
+
+    return "{}"
+
+
+def error_response(status_code: int, message: str, error_type: str) -> JSONResponse:
+    """Error body in the OpenAI format"""
+    return JSONResponse(
+        status_code=status_code,
+        content={"error": {"message": message, "type": error_type, "param": None, "code": None}},
+    )
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    """Mimic POST /v1/chat/completions"""
+    body: Dict[str, Any] = await request.json()
+    await asyncio.sleep(sample_latency(mock_settings.LATENCY))
+
+    roll = rng.random()
+    if roll < mock_settings.RATE_LIMIT_RATE:
+        return error_response(429, "Rate limit reached (mock)", "rate_limit_error")
+    if roll < mock_settings.RATE_LIMIT_RATE + mock_settings.ERROR_RATE:
+        return error_response(500, "Internal server error (mock)", "server_error")
+
+    prompt = body.get("messages", [{}])[-1].get("content", "")
+    content = build_content(prompt)
+
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": (len(prompt) + len(content)) // 4,
+        },
+    }
+
+
+@app.get("/v1/models")
+async def list_models():
+    """Mimic GET /v1/models"""
+    return {"object": "list", "data": [{"id": "mock", "object": "model", "owned_by": "prodlens"}]}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run a local mock of the OpenAI chat-completions API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", default=MockSettings.LATENCY,
+                        help="fixed:S | uniform:LO:HI | normal:MEAN:SD | exponential:MEAN | lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests failing with 429")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    sample_latency(args.latency)  # fail fast on a bad spec
+    mock_settings.LATENCY = args.latency
+    mock_settings.ERROR_RATE = args.error_rate
+    mock_settings.RATE_LIMIT_RATE = args.rate_limit_rate
+    mock_settings.SEED = args.seed
+    rng.seed(args.seed)
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -9,12 +9,19 @@ class AppConfigModel(BaseModel):
     blocks: Optional[Dict[str, Any]] = None
     dependencies: Optional[Dict[str, str]] = None
     metadata: Optional[Dict[str, Any]] = None
+    lockfile: Optional[str] = Field(default=None, description="package-lock.json or requirements.txt contents")
+    lockfileName: Optional[str] = Field(default=None, description="Lockfile name, used to detect its format")
 
 class AnalysisRequestModel(BaseModel):
     """Analysis request model"""
     appConfig: AppConfigModel
     appName: str
 
+class WeightSimulationRequestModel(BaseModel):
+    """What-if scoring weight simulation request"""
+    weights: List[Dict[str, float]] = Field(description="Candidate category weights, one dict per policy")
+    baseline: Optional[Dict[str, float]] = Field(default=None, description="Weights to compare against (defaults to current settings)")
+
 # Response Models
 class CategoryScoreModel(BaseModel):
     """Category score response"""
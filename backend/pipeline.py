@@ -0,0 +1,432 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+from records import AnalysisResult, TestSuggestion, Recommendation, from_dict, to_model
+from analysis_engine import RuleBasedAnalyzer
+from dependency_graph import DependencyStats, parse_lockfile
+from scoring import overall_score
+from ai_analyzer import (
+    AIAnalyzer,
+    DEFAULT_TEST_SUGGESTIONS,
+    DEFAULT_RECOMMENDATIONS,
+)
+from config import settings
+
+# Initialize AI Analyzer
+ai_analyzer = AIAnalyzer()
+
+LOCKFILE_KEYS = ("lockfile", "lockfileName")
+
+CATEGORY_SECTIONS = tuple(settings.SCORING_WEIGHTS)
+
+# Analyzers costing at least this (ms) run concurrently: coroutines as tasks,
+# plain functions on a worker thread while other work is in flight
+CONCURRENT_COST_MS = 1.0
+
+
+def extract_lockfile(app_config: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[DependencyStats]]:
+    """
+    Split the lockfile off an app config and summarize its dependency graph
+    
+    The raw lockfile is removed so the text-matching rules and AI prompts
+    only see the config itself; direct dependencies from the lockfile are
+    merged into "dependencies" (entries already in the config win).
+    
+    Args:
+        app_config: Application configuration, possibly with lockfile fields
+        
+    Returns:
+        Config without lockfile fields, and dependency stats (None without a lockfile)
+    """
+    lockfile = app_config.get("lockfile")
+    if not lockfile:
+        if any(key in app_config for key in LOCKFILE_KEYS):
+            app_config = {key: value for key, value in app_config.items() if key not in LOCKFILE_KEYS}
+        return app_config, None
+
+    graph = parse_lockfile(lockfile, app_config.get("lockfileName"))
+    app_config = {key: value for key, value in app_config.items() if key not in LOCKFILE_KEYS}
+    app_config["dependencies"] = {**graph.direct_dependencies(), **(app_config.get("dependencies") or {})}
+
+    return app_config, graph.stats()
+
+
+class AnalysisContext(NamedTuple):
+    """Inputs shared by every analyzer of one analysis"""
+    appConfig: Dict[str, Any]
+    dependencyStats: Optional[DependencyStats]
+    useAi: bool
+    serial: bool = False  # run plain analyzers on the calling thread, one after another
+    aiFallbacks: Optional[List[str]] = None  # collects AI sections that fell back to defaults
+
+
+AnalyzerFunc = Callable[[AnalysisContext, Dict[str, Any]], Union[Any, Awaitable[Any]]]
+
+
+class Analyzer(NamedTuple):
+    """
+    Registered analysis section
+
+    run receives the context and the results of the analyzers it requires;
+    it may be a plain function or a coroutine function. cost is a rough
+    estimate in milliseconds, used to start expensive work first and to
+    decide what runs concurrently. AI analyzers only cost that much when
+    AI is enabled for the analysis.
+    """
+    name: str
+    run: AnalyzerFunc
+    requires: Tuple[str, ...] = ()
+    cost: float = 0.1
+    ai: bool = False
+
+    def effective_cost(self, context: AnalysisContext) -> float:
+        return self.cost if context.useAi or not self.ai else 0.0
+
+
+def _category(analyze: Callable[..., Any], uses_dependencies: bool = False) -> AnalyzerFunc:
+    """Wrap a RuleBasedAnalyzer category method as an analyzer"""
+    if uses_dependencies:
+        return lambda context, inputs: analyze(context.appConfig, context.dependencyStats)
+    return lambda context, inputs: analyze(context.appConfig)
+
+
+def _overall_score(context: AnalysisContext, inputs: Dict[str, Any]) -> int:
+    return overall_score(inputs)
+
+
+def _ai_fallback(context: AnalysisContext, section: str, default: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """Record that an AI section fell back to its defaults"""
+    if context.useAi and context.aiFallbacks is not None:
+        context.aiFallbacks.append(section)
+    return default
+
+
+def _risks(context: AnalysisContext, inputs: Dict[str, Any]) -> Tuple[Any, ...]:
+    return tuple(RuleBasedAnalyzer.generate_risks(context.appConfig))
+
+
+def _insights(context: AnalysisContext, inputs: Dict[str, Any]) -> Tuple[Any, ...]:
+    return tuple(RuleBasedAnalyzer.generate_insights(context.appConfig, context.dependencyStats))
+
+
+async def _test_suggestions(context: AnalysisContext, inputs: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Try AI first, fallback to default"""
+    test_suggestions = []
+    if context.useAi:
+        ai_response = await ai_analyzer.analyze_with_ai(context.appConfig, "testStrategy")
+        if ai_response:
+            parsed = AIAnalyzer.parse_json_response(ai_response)
+            if "suggestions" in parsed:
+                for sugg in parsed["suggestions"][:5]:
+                    test_suggestions.append(from_dict(TestSuggestion, sugg))
+
+    return tuple(test_suggestions) or _ai_fallback(context, "testSuggestions", DEFAULT_TEST_SUGGESTIONS)
+
+
+def _scale_analysis(context: AnalysisContext, inputs: Dict[str, Any]) -> Any:
+    # Imported here so analyses without this section never load the model (or numpy)
+    from capacity_model import analyze_capacity
+
+    return analyze_capacity(context.appConfig)
+
+
+async def _recommendations(context: AnalysisContext, inputs: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Try AI first, fallback to rule-based"""
+    recommendations = []
+    if context.useAi:
+        ai_response = await ai_analyzer.analyze_with_ai(context.appConfig, "recommendations")
+        if ai_response:
+            parsed = AIAnalyzer.parse_json_response(ai_response)
+            if "recommendations" in parsed:
+                for rec in parsed["recommendations"][:6]:
+                    recommendations.append(from_dict(Recommendation, rec))
+
+    return tuple(recommendations) or _ai_fallback(context, "recommendations", DEFAULT_RECOMMENDATIONS)
+
+
+# Analyzer registry, in response order
+ANALYZERS: Dict[str, Analyzer] = {}
+
+
+def register_analyzer(analyzer: Analyzer) -> None:
+    """Add or replace an analysis section"""
+    unknown = [name for name in analyzer.requires if name not in ANALYZERS]
+    if unknown:
+        raise ValueError(f"Analyzer '{analyzer.name}' requires unregistered sections: {', '.join(unknown)}")
+    ANALYZERS[analyzer.name] = analyzer
+
+
+for _analyzer in (
+    Analyzer("scalability", _category(RuleBasedAnalyzer.analyze_scalability)),
+    Analyzer("security", _category(RuleBasedAnalyzer.analyze_security, uses_dependencies=True)),
+    Analyzer("testability", _category(RuleBasedAnalyzer.analyze_testability)),
+    Analyzer("maintainability", _category(RuleBasedAnalyzer.analyze_maintainability, uses_dependencies=True)),
+    Analyzer("performance", _category(RuleBasedAnalyzer.analyze_performance)),
+    Analyzer("overallScore", _overall_score, requires=CATEGORY_SECTIONS, cost=0.01),
+    Analyzer("risks", _risks),
+    Analyzer("insights", _insights),
+    Analyzer("testSuggestions", _test_suggestions, cost=1500, ai=True),
+    Analyzer("scaleAnalysis", _scale_analysis, cost=10),
+    Analyzer("recommendations", _recommendations, cost=1500, ai=True),
+):
+    register_analyzer(_analyzer)
+
+# Shorthands accepted in ?sections=
+SECTION_GROUPS = {"categories": CATEGORY_SECTIONS}
+
+
+def parse_sections(sections: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated ?sections= value
+    
+    Args:
+        sections: e.g. "security,risks" or "categories,scaleAnalysis"
+        
+    Returns:
+        Section names (None when not given, meaning all)
+    """
+    if sections is None:
+        return None
+
+    names: List[str] = []
+    for name in (part.strip() for part in sections.split(",")):
+        if not name:
+            continue
+        expanded = SECTION_GROUPS.get(name, (name,))
+        unknown = [section for section in expanded if section not in ANALYZERS]
+        if unknown:
+            raise ValueError(
+                f"Unknown section '{name}'. Use any of: {', '.join([*ANALYZERS, *SECTION_GROUPS])}"
+            )
+        names.extend(expanded)
+
+    if not names:
+        raise ValueError("No sections requested")
+    return tuple(dict.fromkeys(names))
+
+
+def plan_sections(sections: Iterable[str]) -> List[str]:
+    """Requested sections plus everything they require, dependencies first"""
+    plan: Dict[str, None] = {}
+
+    def visit(name: str) -> None:
+        if name not in plan:
+            for required in ANALYZERS[name].requires:
+                visit(required)
+            plan[name] = None
+
+    for name in sections:
+        visit(name)
+    return list(plan)
+
+
+def dependent_sections(sections: Iterable[str]) -> List[str]:
+    """Sections plus every section that (transitively) requires them, in registry order"""
+    affected = set(sections)
+    for name, analyzer in ANALYZERS.items():
+        if affected.intersection(analyzer.requires):
+            affected.add(name)
+    return [name for name in ANALYZERS if name in affected]
+
+
+async def run_analyzers(
+    context: AnalysisContext,
+    sections: Iterable[str],
+    known: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Run the analyzers needed for sections, concurrently where independent
+    
+    Cheap analyzers run inline as soon as their inputs are ready. Costly
+    coroutine analyzers (AI calls) become tasks, costliest first, and
+    costly plain analyzers go to a worker thread while those are in
+    flight, so independent slow work overlaps. With context.serial, plain
+    analyzers all run one after another on the calling thread instead
+    (cProfile only sees that thread); AI calls still wait on the executor,
+    so they never block the event loop.
+    
+    Args:
+        context: Shared analysis inputs
+        sections: Section names to compute
+        known: Still-valid results to reuse instead of recomputing
+        
+    Returns:
+        Results by section name (including required and known sections)
+    """
+    loop = asyncio.get_running_loop()
+    results: Dict[str, Any] = dict(known or {})
+    remaining = [name for name in plan_sections(sections) if name not in results]
+    running: Dict["asyncio.Future[Any]", str] = {}
+
+    try:
+        while remaining or running:
+            ready = [
+                ANALYZERS[name] for name in remaining
+                if all(required in results for required in ANALYZERS[name].requires)
+            ]
+            ready.sort(key=lambda analyzer: analyzer.effective_cost(context), reverse=True)
+
+            ran_inline = False
+            for analyzer in ready:
+                remaining.remove(analyzer.name)
+                inputs = {required: results[required] for required in analyzer.requires}
+                concurrent = analyzer.effective_cost(context) >= CONCURRENT_COST_MS
+
+                if asyncio.iscoroutinefunction(analyzer.run):
+                    if concurrent:
+                        running[asyncio.ensure_future(analyzer.run(context, inputs))] = analyzer.name
+                        continue
+                    results[analyzer.name] = await analyzer.run(context, inputs)
+                elif concurrent and running and not context.serial:
+                    running[loop.run_in_executor(None, analyzer.run, context, inputs)] = analyzer.name
+                    continue
+                else:
+                    results[analyzer.name] = analyzer.run(context, inputs)
+                ran_inline = True
+
+            if ran_inline or not running:
+                continue
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+    finally:
+        for future in running:
+            future.cancel()
+
+    return results
+
+
+def _analysis_context(
+    app_config: Dict[str, Any],
+    use_ai: bool,
+    serial: bool = False,
+    ai_fallbacks: Optional[List[str]] = None,
+) -> AnalysisContext:
+    app_config, dependency_stats = extract_lockfile(app_config)
+    return AnalysisContext(
+        appConfig=app_config,
+        dependencyStats=dependency_stats,
+        useAi=use_ai and ai_analyzer.is_available(),
+        serial=serial,
+        aiFallbacks=ai_fallbacks,
+    )
+
+
+async def perform_analysis(
+    app_config: Dict[str, Any],
+    app_name: str,
+    use_ai: bool = True,
+    serial: bool = False,
+    ai_fallbacks: Optional[List[str]] = None,
+) -> AnalysisResult:
+    """
+    Perform complete analysis on app configuration
+    
+    Args:
+        app_config: Application configuration
+        app_name: Application name
+        use_ai: Allow LLM calls (rule engine and defaults only when False)
+        serial: Run plain analyzers on the calling thread (for profiling)
+        ai_fallbacks: Optional list that receives the AI sections that
+            failed and fell back to their defaults
+        
+    Returns:
+        Complete analysis result
+    """
+    context = _analysis_context(app_config, use_ai, serial, ai_fallbacks)
+    results = await run_analyzers(context, ANALYZERS)
+    return _assemble_result(app_name, results)
+
+
+def _assemble_result(app_name: str, results: Dict[str, Any]) -> AnalysisResult:
+    """Build the full result record from section results"""
+    return AnalysisResult(
+        appName=app_name,
+        timestamp=datetime.now().isoformat(),
+        overallScore=results["overallScore"],
+        categories={name: results[name] for name in CATEGORY_SECTIONS},
+        risks=results["risks"],
+        insights=results["insights"],
+        testSuggestions=results["testSuggestions"],
+        scaleAnalysis=results["scaleAnalysis"],
+        recommendations=results["recommendations"],
+    )
+
+
+def result_sections(result: AnalysisResult) -> Dict[str, Any]:
+    """Split a full result record back into section results"""
+    sections = {name: value for name, value in result._asdict().items() if name in ANALYZERS}
+    sections.update(result.categories)
+    return sections
+
+
+async def reanalyze(
+    app_config: Dict[str, Any],
+    previous: AnalysisResult,
+    stale: Iterable[str],
+    use_ai: bool = True,
+) -> AnalysisResult:
+    """
+    Recompute only the stale sections of a previous result
+    
+    Args:
+        app_config: Application configuration the previous result came from
+        previous: Previous full result
+        stale: Invalidated sections; sections requiring them are recomputed too
+        use_ai: Allow LLM calls
+        
+    Returns:
+        Full result combining reused and recomputed sections
+    """
+    stale = dependent_sections(stale)
+    known = {name: value for name, value in result_sections(previous).items() if name not in stale}
+    context = _analysis_context(app_config, use_ai)
+    results = await run_analyzers(context, stale, known)
+    return _assemble_result(previous.appName, results)
+
+
+def _section_data(value: Any) -> Any:
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return to_model(value).dict()
+    if isinstance(value, tuple):
+        return [_section_data(item) for item in value]
+    return value
+
+
+async def analyze_sections(
+    app_config: Dict[str, Any],
+    app_name: str,
+    sections: Iterable[str],
+    use_ai: bool = True,
+    serial: bool = False,
+    ai_fallbacks: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Compute only the requested sections
+    
+    Args:
+        app_config: Application configuration
+        app_name: Application name
+        sections: Section names from ANALYZERS (see parse_sections)
+        use_ai: Allow LLM calls
+        serial: Run plain analyzers on the calling thread (for profiling)
+        ai_fallbacks: Optional list that receives the AI sections that
+            failed and fell back to their defaults
+        
+    Returns:
+        Partial analysis in the full result's shape: appName, timestamp and
+        the requested sections, with categories nested under "categories"
+    """
+    sections = tuple(sections)
+    context = _analysis_context(app_config, use_ai, serial, ai_fallbacks)
+    results = await run_analyzers(context, sections)
+
+    data: Dict[str, Any] = {"appName": app_name, "timestamp": datetime.now().isoformat()}
+    for name in sections:
+        if name in CATEGORY_SECTIONS:
+            data.setdefault("categories", {})[name] = _section_data(results[name])
+        else:
+            data[name] = _section_data(results[name])
+
+    return data
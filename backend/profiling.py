@@ -0,0 +1,168 @@
+import cProfile
+import hmac
+import io
+import marshal
+import pstats
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple, TypeVar
+from config import settings
+
+PROFILE_HEADER = "X-ProdLens-Profile"
+
+T = TypeVar("T")
+
+
+class ProfileRecord(NamedTuple):
+    """One captured profile"""
+    profileId: str
+    appName: str
+    timestamp: str
+    durationMs: float
+    peakMemoryBytes: int
+    topAllocations: Tuple[str, ...]
+    stats: bytes  # marshalled pstats data, loadable with pstats / snakeviz
+
+    def summary(self) -> Dict[str, Any]:
+        """Listing view without the raw stats"""
+        return {
+            "profileId": self.profileId,
+            "appName": self.appName,
+            "timestamp": self.timestamp,
+            "durationMs": self.durationMs,
+            "peakMemoryBytes": self.peakMemoryBytes,
+            "topAllocations": list(self.topAllocations),
+        }
+
+    def report(self, limit: int = 30) -> str:
+        """Human-readable cumulative-time report"""
+        output = io.StringIO()
+        stats = pstats.Stats(_StatsSource(marshal.loads(self.stats)), stream=output)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return output.getvalue()
+
+
+class _StatsSource:
+    """Adapter letting pstats.Stats load already-collected stats"""
+
+    def __init__(self, stats: Dict[Any, Any]):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+class ProfileStore:
+    """
+    Opt-in per-request profiling with sampling limits
+
+    At most one analysis is profiled at a time, and at most
+    PROFILING_MAX_PER_WINDOW per PROFILING_WINDOW_SECONDS. Captured profiles
+    are kept in a bounded in-memory ring. The profiled analysis runs in
+    serial mode, so its CPU work stays on the thread cProfile observes;
+    AI calls still run on the executor and show up as await time.
+    tracemalloc is process-wide, so the memory peak also counts allocations
+    of requests running meanwhile.
+    """
+
+    def __init__(self):
+        self.profiles: Deque[ProfileRecord] = deque(maxlen=settings.PROFILING_MAX_STORED)
+        self._started: Deque[float] = deque()
+        self._busy = False
+        self._counter = 0
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return bool(settings.PROFILING_ADMIN_TOKEN)
+
+    @staticmethod
+    def is_authorized(token: Optional[str]) -> bool:
+        """Check an admin token (constant-time)"""
+        return bool(
+            token
+            and settings.PROFILING_ADMIN_TOKEN
+            and hmac.compare_digest(token.encode(), settings.PROFILING_ADMIN_TOKEN.encode())
+        )
+
+    def _acquire(self) -> Optional[str]:
+        """Reserve a profiling slot, or return why none is available"""
+        if self._busy:
+            return "another analysis is being profiled"
+
+        now = time.monotonic()
+        while self._started and now - self._started[0] > settings.PROFILING_WINDOW_SECONDS:
+            self._started.popleft()
+        if len(self._started) >= settings.PROFILING_MAX_PER_WINDOW:
+            return "profiling rate limit reached"
+
+        self._busy = True
+        self._started.append(now)
+        return None
+
+    async def run(
+        self,
+        app_name: str,
+        func: Callable[..., Awaitable[T]],
+    ) -> Tuple[T, Optional[str], Optional[str]]:
+        """
+        Run func under cProfile and tracemalloc if a slot is available
+
+        Args:
+            app_name: Application name recorded with the profile
+            func: Coroutine function to profile; called with serial=True when
+                profiled, so it should only offload blocking I/O to other threads
+
+        Returns:
+            (result, profile id or None, reason profiling was skipped or None)
+        """
+        skipped = self._acquire()
+        if skipped:
+            return await func(), None, skipped
+
+        profiler = cProfile.Profile()
+        already_tracing = tracemalloc.is_tracing()
+        if not already_tracing:
+            tracemalloc.start(settings.PROFILING_TRACEBACK_FRAMES)
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+
+        try:
+            profiler.enable()
+            try:
+                result = await func(serial=True)
+            finally:
+                profiler.disable()
+
+            duration_ms = (time.perf_counter() - start) * 1000
+            _, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics("lineno")[:10]
+        finally:
+            if not already_tracing:
+                tracemalloc.stop()
+            self._busy = False
+
+        profiler.create_stats()
+        self._counter += 1
+        record = ProfileRecord(
+            profileId=f"profile_{self._counter}",
+            appName=app_name,
+            timestamp=datetime.now().isoformat(),
+            durationMs=round(duration_ms, 3),
+            peakMemoryBytes=peak,
+            topAllocations=tuple(str(stat) for stat in top),
+            stats=marshal.dumps(profiler.stats),
+        )
+        self.profiles.append(record)
+
+        return result, record.profileId, None
+
+    def get(self, profile_id: str) -> Optional[ProfileRecord]:
+        for record in self.profiles:
+            if record.profileId == profile_id:
+                return record
+        return None
+
+    def list(self) -> List[Dict[str, Any]]:
+        return [record.summary() for record in reversed(self.profiles)]
@@ -0,0 +1,398 @@
+import asyncio
+import hashlib
+import heapq
+import json
+import os
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from records import AnalysisResult, result_from_dict
+from pipeline import ANALYZERS, ai_analyzer, perform_analysis, reanalyze
+from config import settings
+
+# Queue priorities, lowest first
+PRIORITY_MISSING = 0  # no usable result at all
+PRIORITY_SCORES = 1  # rules or weights changed: scores users see are wrong
+PRIORITY_AI = 2  # only LLM sections are outdated (slow and billed)
+
+StoreFunc = Callable[[AnalysisResult, Optional[str]], str]
+
+
+class AnalysisVersion(NamedTuple):
+    """What a result was computed with"""
+    rules: str
+    weights: str
+    model: Optional[str]  # None when no LLM was used
+
+
+@lru_cache(maxsize=64)
+def _weights_fingerprint(weights: Tuple[Tuple[str, float], ...]) -> str:
+    return hashlib.sha256(json.dumps(weights).encode()).hexdigest()[:12]
+
+
+def current_version(use_ai: bool) -> AnalysisVersion:
+    """Version a fresh analysis would be computed with right now"""
+    return AnalysisVersion(
+        rules=settings.RULES_VERSION,
+        weights=_weights_fingerprint(tuple(sorted(settings.SCORING_WEIGHTS.items()))),
+        model=settings.OPENAI_MODEL if use_ai and ai_analyzer.is_available() else None,
+    )
+
+
+def stale_sections(old: AnalysisVersion, new: AnalysisVersion) -> List[str]:
+    """
+    Sections invalidated between two versions
+
+    A rules change invalidates every rule-based section, a weights change
+    only the overall score, and a model change only the LLM sections (when
+    an LLM is available now; otherwise the previous LLM output is kept).
+    Sections requiring a stale one are recomputed by reanalyze as well.
+    """
+    stale: List[str] = []
+    if old.rules != new.rules:
+        stale += [name for name, analyzer in ANALYZERS.items() if not analyzer.ai]
+    elif old.weights != new.weights:
+        stale.append("overallScore")
+    if new.model is not None and old.model != new.model:
+        stale += [name for name, analyzer in ANALYZERS.items() if analyzer.ai]
+    return stale
+
+
+class TrackedApp:
+    """A registered app config and its latest result"""
+
+    def __init__(self, tracked_id: str, app_name: str, app_config: Dict[str, Any], use_ai: bool):
+        self.trackedId = tracked_id
+        self.appName = app_name
+        self.appConfig = app_config
+        self.useAi = use_ai
+        self.analysisId: Optional[str] = None
+        self.result: Optional[AnalysisResult] = None
+        self.version: Optional[AnalysisVersion] = None
+        self.analyzedAt: Optional[str] = None
+        self.failures = 0
+        self.lastError: Optional[str] = None
+
+    def stale_sections(self) -> List[str]:
+        if self.result is None or self.version is None:
+            return list(ANALYZERS)
+        return stale_sections(self.version, current_version(self.useAi))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Persisted form"""
+        return {
+            "trackedId": self.trackedId,
+            "appName": self.appName,
+            "appConfig": self.appConfig,
+            "useAi": self.useAi,
+            "analyzedAt": self.analyzedAt,
+            "version": self.version._asdict() if self.version else None,
+            "result": self.result.to_model().model_dump() if self.result else None,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "trackedId": self.trackedId,
+            "appName": self.appName,
+            "analysisId": self.analysisId,
+            "analyzedAt": self.analyzedAt,
+            "version": self.version._asdict() if self.version else None,
+            "staleSections": self.stale_sections(),
+            "lastError": self.lastError,
+        }
+
+
+class Activity:
+    """In-flight API requests and when the last one finished"""
+
+    def __init__(self):
+        self.active = 0
+        self.lastFinished = 0.0
+
+    def is_idle(self) -> bool:
+        return self.active == 0 and time.monotonic() - self.lastFinished >= settings.REANALYSIS_IDLE_SECONDS
+
+
+class ActivityMiddleware:
+    """Plain ASGI middleware feeding Activity, so the scheduler can yield to API traffic"""
+
+    def __init__(self, app: Any, activity: Activity):
+        self.app = app
+        self.activity = activity
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self.activity.active += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.activity.active -= 1
+            self.activity.lastFinished = time.monotonic()
+
+
+class ReanalysisScheduler:
+    """
+    Keeps results of tracked apps fresh in the background
+
+    When the rules version, scoring weights or LLM model change, stale
+    tracked apps are queued by priority (wrong scores before outdated LLM
+    text, oldest results first) and re-analyzed one at a time, at most one
+    per REANALYSIS_MIN_INTERVAL and only while no API request has been
+    active for REANALYSIS_IDLE_SECONDS. Only invalidated sections are
+    recomputed. Tracked apps must persist (TRACKED_APPS_DIR), since the
+    versions only change on a restart with new code or settings.
+    """
+
+    def __init__(self, store: StoreFunc):
+        self.apps: Dict[str, TrackedApp] = {}
+        self.activity = Activity()
+        self._store = store
+        self._queue: List[Tuple[int, str, int, str]] = []
+        self._queued: Dict[str, int] = {}
+        self._sequence = 0
+        self._counter = 0
+        self._scanned: Dict[bool, AnalysisVersion] = {}
+        self._next_run = 0.0
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    # Registration
+
+    async def register(self, app_name: str, app_config: Dict[str, Any], use_ai: bool = True) -> TrackedApp:
+        """
+        Track an app config, analyzing it right away
+
+        Args:
+            app_name: Application name
+            app_config: Application configuration
+            use_ai: Allow LLM calls for this app
+
+        Returns:
+            Tracked app with its first result
+        """
+        if not settings.TRACKED_APPS_DIR:
+            # Versions only change across deploys; without persistence the
+            # tracked apps would be gone before anything went stale
+            raise RuntimeError("Tracking apps requires TRACKED_APPS_DIR to be set")
+
+        self._counter += 1
+        app = TrackedApp(f"tracked_{self._counter}", app_name, app_config, use_ai)
+        await self._analyze(app, list(ANALYZERS))
+        self.apps[app.trackedId] = app
+        await self.save(app)
+        return app
+
+    async def unregister(self, tracked_id: str) -> bool:
+        if self.apps.pop(tracked_id, None) is None:
+            return False
+        self._queued.pop(tracked_id, None)
+        await self.delete(tracked_id)
+        return True
+
+    # Queue
+
+    def enqueue(self, app: TrackedApp, priority: int) -> None:
+        """Queue an app, keeping only its most urgent entry"""
+        queued = self._queued.get(app.trackedId)
+        if queued is not None and queued <= priority:
+            return
+        self._sequence += 1
+        self._queued[app.trackedId] = priority
+        heapq.heappush(self._queue, (priority, app.analyzedAt or "", self._sequence, app.trackedId))
+
+    def queue_length(self) -> int:
+        return len(self._queued)
+
+    def scan(self, force: bool = False) -> int:
+        """
+        Queue stale apps, scanning only when a version changed since the last scan
+
+        Returns:
+            Number of apps queued
+        """
+        versions = {use_ai: current_version(use_ai) for use_ai in (False, True)}
+        if not force and versions == self._scanned:
+            return 0
+        self._scanned = versions
+
+        queued = 0
+        for app in self.apps.values():
+            priority = self._priority(app)
+            if priority is not None:
+                self.enqueue(app, priority)
+                queued += 1
+        return queued
+
+    def _priority(self, app: TrackedApp) -> Optional[int]:
+        stale = app.stale_sections()
+        if not stale:
+            return None
+        if app.result is None:
+            return PRIORITY_MISSING
+        if any(not ANALYZERS[name].ai for name in stale):
+            return PRIORITY_SCORES
+        return PRIORITY_AI
+
+    async def run_next(self) -> Optional[str]:
+        """
+        Re-analyze the most urgent queued app that is still stale
+
+        Returns:
+            Tracked id of the app re-analyzed, or None if nothing was due
+        """
+        while self._queue:
+            priority, _, _, tracked_id = heapq.heappop(self._queue)
+            if self._queued.get(tracked_id) != priority:
+                continue  # superseded or unregistered
+            del self._queued[tracked_id]
+
+            app = self.apps.get(tracked_id)
+            stale = app.stale_sections() if app else []
+            if not stale:
+                continue
+
+            try:
+                await self._analyze(app, stale)
+            except Exception as e:
+                app.failures += 1
+                app.lastError = str(e)
+                if app.failures < settings.REANALYSIS_MAX_ATTEMPTS:
+                    self.enqueue(app, self._priority(app))
+                return tracked_id
+
+            await self.save(app)
+            return tracked_id
+
+        return None
+
+    async def _analyze(self, app: TrackedApp, stale: List[str]) -> None:
+        # Versions are captured first: a change mid-run is caught by the next scan
+        version = current_version(app.useAi)
+        if app.result is None or len(stale) == len(ANALYZERS):
+            result = await perform_analysis(app.appConfig, app.appName, use_ai=app.useAi)
+        else:
+            result = await reanalyze(app.appConfig, app.result, stale, use_ai=app.useAi)
+
+        app.result = result
+        app.version = version
+        app.analyzedAt = datetime.now().isoformat()
+        app.failures = 0
+        app.lastError = None
+        app.analysisId = self._store(result, app.analysisId)
+
+    # Background loop
+
+    def start(self) -> None:
+        if not settings.TRACKED_APPS_DIR:
+            print("Re-analysis scheduler disabled: set TRACKED_APPS_DIR to track apps")
+            return
+
+        self.load()
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.REANALYSIS_POLL_SECONDS)
+            try:
+                self.scan()
+                if self._queued and self.activity.is_idle() and time.monotonic() >= self._next_run:
+                    if await self.run_next():
+                        self._next_run = time.monotonic() + settings.REANALYSIS_MIN_INTERVAL
+            except Exception as e:
+                print(f"Re-analysis error: {str(e)}")
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "trackedApps": len(self.apps),
+            "queued": self.queue_length(),
+            "idle": self.activity.is_idle(),
+            "currentVersion": current_version(True)._asdict(),
+        }
+
+    # Persistence (only with TRACKED_APPS_DIR): one JSON file per tracked app
+
+    @staticmethod
+    def _path(tracked_id: str) -> str:
+        return os.path.join(settings.TRACKED_APPS_DIR, f"{tracked_id}.json")
+
+    def _persist_lock(self) -> asyncio.Lock:
+        # Created on first use so it belongs to the running event loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def save(self, app: TrackedApp) -> None:
+        """Write one tracked app and its result on a worker thread"""
+        if not settings.TRACKED_APPS_DIR:
+            return
+
+        entry = app.to_dict()
+        async with self._persist_lock():
+            if app.trackedId in self.apps:
+                await asyncio.get_running_loop().run_in_executor(None, _write_json, self._path(app.trackedId), entry)
+
+    async def delete(self, tracked_id: str) -> None:
+        if not settings.TRACKED_APPS_DIR:
+            return
+
+        async with self._persist_lock():
+            await asyncio.get_running_loop().run_in_executor(None, _remove_file, self._path(tracked_id))
+
+    def load(self) -> None:
+        """Restore tracked apps at startup; results from older versions are queued by the first scan"""
+        directory = settings.TRACKED_APPS_DIR
+        if not directory or not os.path.isdir(directory):
+            return
+
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                entry = json.load(f)
+
+            app = TrackedApp(entry["trackedId"], entry["appName"], entry["appConfig"], entry["useAi"])
+            try:
+                app.result = result_from_dict(entry["result"]) if entry.get("result") else None
+                app.version = AnalysisVersion(**entry["version"]) if entry.get("version") else None
+            except Exception as e:
+                # Results that no longer validate are recomputed from scratch
+                app.result, app.version, app.lastError = None, None, str(e)
+            app.analyzedAt = entry.get("analyzedAt")
+            if app.result is not None:
+                app.analysisId = self._store(app.result, None)
+            self.apps[app.trackedId] = app
+
+            number = app.trackedId.rsplit("_", 1)[-1]
+            if number.isdigit():
+                self._counter = max(self._counter, int(number))
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    """Replace a file atomically"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(temporary, path)
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
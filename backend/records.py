@@ -0,0 +1,157 @@
+from typing import Any, Dict, NamedTuple, Tuple
+from models import (
+    AnalysisResultModel,
+    CategoryScoreModel,
+    InsightModel,
+    RecommendationModel,
+    RiskModel,
+    ScaleAnalysisModel,
+    TestSuggestionModel,
+)
+
+# Internal Records
+#
+# The engine works on these immutable tuples instead of Pydantic models.
+# Constant sections are built once at module level and shared by every
+# result; conversion to the API models happens only at the response
+# boundary via to_model(). Those constants are registered with
+# intern_records() so their models are built once too.
+
+class CategoryScore(NamedTuple):
+    """Category score record"""
+    score: int
+    level: str
+    issues: Tuple[str, ...]
+    suggestions: Tuple[str, ...]
+
+class Risk(NamedTuple):
+    """Risk record"""
+    category: str
+    severity: str
+    title: str
+    description: str
+    impact: str
+    mitigation: str
+
+class Insight(NamedTuple):
+    """Insight record"""
+    category: str
+    title: str
+    description: str
+    actionable: bool
+
+class TestSuggestion(NamedTuple):
+    """Test suggestion record"""
+    type: str
+    title: str
+    description: str
+    priority: str
+    estimatedDuration: str
+
+class ScaleAnalysis(NamedTuple):
+    """Scale analysis record"""
+    title: str
+    breakingPoints: Tuple[str, ...]
+    recommendations: Tuple[str, ...]
+    readinessLevel: str
+
+class Recommendation(NamedTuple):
+    """Recommendation record"""
+    priority: str
+    category: str
+    action: str
+    rationale: str
+    estimatedEffort: str
+
+class AnalysisResult(NamedTuple):
+    """Analysis result record"""
+    appName: str
+    timestamp: str
+    overallScore: int
+    categories: Dict[str, CategoryScore]
+    risks: Tuple[Risk, ...]
+    insights: Tuple[Insight, ...]
+    testSuggestions: Tuple[TestSuggestion, ...]
+    scaleAnalysis: ScaleAnalysis
+    recommendations: Tuple[Recommendation, ...]
+
+    def to_model(self) -> AnalysisResultModel:
+        """Convert to the API response model"""
+        return AnalysisResultModel.model_construct(
+            appName=self.appName,
+            timestamp=self.timestamp,
+            overallScore=self.overallScore,
+            categories={name: to_model(category) for name, category in self.categories.items()},
+            risks=[to_model(risk) for risk in self.risks],
+            insights=[to_model(insight) for insight in self.insights],
+            testSuggestions=[to_model(sugg) for sugg in self.testSuggestions],
+            scaleAnalysis=to_model(self.scaleAnalysis),
+            recommendations=[to_model(rec) for rec in self.recommendations],
+        )
+
+
+_MODEL_TYPES = {
+    CategoryScore: CategoryScoreModel,
+    Risk: RiskModel,
+    Insight: InsightModel,
+    TestSuggestion: TestSuggestionModel,
+    ScaleAnalysis: ScaleAnalysisModel,
+    Recommendation: RecommendationModel,
+}
+
+
+# Models of interned constant records by record id (the record is kept
+# alongside so its id stays valid); bounded by the constants in the code
+_INTERNED_MODELS: Dict[int, Tuple[NamedTuple, Any]] = {}
+
+
+def intern_records(*records: NamedTuple) -> None:
+    """
+    Share one API model per module-level constant record
+
+    Only for constants: their models are handed to every response, so
+    nothing may mutate the models returned by to_model().
+    """
+    for record in records:
+        _INTERNED_MODELS[id(record)] = (record, _to_model(record))
+
+
+def to_model(record: NamedTuple) -> Any:
+    """Convert a section record to its API model (shared for interned constants)"""
+    interned = _INTERNED_MODELS.get(id(record))
+    if interned is not None:
+        return interned[1]
+    return _to_model(record)
+
+
+def _to_model(record: NamedTuple) -> Any:
+    """Records are trusted engine output, so the models are built without validation"""
+    fields = {
+        name: list(value) if isinstance(value, tuple) else value
+        for name, value in record._asdict().items()
+    }
+    return _MODEL_TYPES[type(record)].model_construct(**fields)
+
+
+def from_dict(record_type: type, data: Dict[str, Any]) -> NamedTuple:
+    """Validate untrusted data (e.g. LLM output) with the API model and store it as a record"""
+    validated = _MODEL_TYPES[record_type](**data)
+    return record_type(**{
+        name: tuple(value) if isinstance(value, list) else value
+        for name, value in validated.dict().items()
+    })
+
+
+def result_from_dict(data: Dict[str, Any]) -> AnalysisResult:
+    """Rebuild a full result record from its API form (e.g. persisted JSON)"""
+    return AnalysisResult(
+        appName=data["appName"],
+        timestamp=data["timestamp"],
+        overallScore=data["overallScore"],
+        categories={name: from_dict(CategoryScore, category) for name, category in data["categories"].items()},
+        risks=tuple(from_dict(Risk, risk) for risk in data["risks"]),
+        insights=tuple(from_dict(Insight, insight) for insight in data["insights"]),
+        testSuggestions=tuple(from_dict(TestSuggestion, sugg) for sugg in data["testSuggestions"]),
+        scaleAnalysis=from_dict(ScaleAnalysis, data["scaleAnalysis"]),
+        recommendations=tuple(from_dict(Recommendation, rec) for rec in data["recommendations"]),
+    )
@@ -0,0 +1,216 @@
+import importlib.util
+import zlib
+from typing import Any, Dict, Optional, Type, TypeVar
+from fastapi import HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+from config import settings
+
+# Optional codecs; checked here, imported on first use
+ZSTD_AVAILABLE = importlib.util.find_spec("zstandard") is not None
+MSGPACK_AVAILABLE = importlib.util.find_spec("msgpack") is not None
+
+JSON_CONTENT_TYPES = {"application/json"}
+MSGPACK_CONTENT_TYPES = {"application/msgpack", "application/x-msgpack", "application/vnd.msgpack"}
+
+# zstd output can't be capped per call, so compressed input is fed in small
+# slices to bound how far a single call can overshoot the size limit
+ZSTD_INPUT_SLICE = 128
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class _SizeGuard:
+    """Tracks compressed and decompressed size against the size cap"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.compressed = 0
+        self.decompressed = 0
+
+    def add_compressed(self, size: int) -> None:
+        self.compressed += size
+        if self.compressed > self.max_size:
+            raise HTTPException(status_code=413, detail=f"Request body exceeds {self.max_size} bytes")
+
+    def add_decompressed(self, size: int) -> None:
+        self.decompressed += size
+        if self.decompressed > self.max_size:
+            raise HTTPException(status_code=413, detail=f"Decompressed body exceeds {self.max_size} bytes")
+
+
+class _IdentityDecoder:
+    def __init__(self, guard: _SizeGuard):
+        self.guard = guard
+
+    def decode(self, chunk: bytes) -> bytes:
+        self.guard.add_decompressed(len(chunk))
+        return chunk
+
+    def finish(self) -> None:
+        pass
+
+
+class _GzipDecoder:
+    """Streaming gzip, including concatenated members (e.g. "gzip -c a b")"""
+
+    def __init__(self, guard: _SizeGuard):
+        self.guard = guard
+        self.decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+
+    def decode(self, chunk: bytes) -> bytes:
+        output = []
+        data = chunk
+        try:
+            while data:
+                if self.decompressor.eof:
+                    self.decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+                # max_length bounds each step, so a tiny chunk can't inflate past the cap at once
+                piece = self.decompressor.decompress(data, 64 * 1024)
+                self.guard.add_decompressed(len(piece))
+                output.append(piece)
+                data = self.decompressor.unused_data if self.decompressor.eof else self.decompressor.unconsumed_tail
+        except zlib.error as e:
+            raise HTTPException(status_code=400, detail=f"Invalid gzip body: {e}")
+        return b"".join(output)
+
+    def finish(self) -> None:
+        if not self.decompressor.eof:
+            raise HTTPException(status_code=400, detail="Truncated gzip body")
+
+
+class _ZstdDecoder:
+    """Streaming zstd, including concatenated frames"""
+
+    def __init__(self, guard: _SizeGuard):
+        if not ZSTD_AVAILABLE:
+            raise HTTPException(status_code=415, detail="zstd content encoding is not supported on this server")
+        import zstandard
+
+        self.guard = guard
+        self.zstandard = zstandard
+        self.decompressor = zstandard.ZstdDecompressor().decompressobj()
+
+    def decode(self, chunk: bytes) -> bytes:
+        output = []
+        try:
+            for start in range(0, len(chunk), ZSTD_INPUT_SLICE):
+                data = chunk[start:start + ZSTD_INPUT_SLICE]
+                while data:
+                    if self.decompressor.eof:
+                        self.decompressor = self.zstandard.ZstdDecompressor().decompressobj()
+                    piece = self.decompressor.decompress(data)
+                    self.guard.add_decompressed(len(piece))
+                    output.append(piece)
+                    data = self.decompressor.unused_data if self.decompressor.eof else b""
+        except self.zstandard.ZstdError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid zstd body: {e}")
+        return b"".join(output)
+
+    def finish(self) -> None:
+        if not self.decompressor.eof:
+            raise HTTPException(status_code=400, detail="Truncated zstd body")
+
+
+DECODERS = {
+    "identity": _IdentityDecoder,
+    "gzip": _GzipDecoder,
+    "x-gzip": _GzipDecoder,
+    "zstd": _ZstdDecoder,
+}
+
+
+async def read_body(request: Request, max_size: Optional[int] = None) -> bytes:
+    """
+    Read and decode the request body as it streams in
+
+    Args:
+        request: Incoming request (Content-Encoding: identity, gzip or zstd)
+        max_size: Cap on compressed and decompressed size (defaults to MAX_FILE_SIZE)
+
+    Returns:
+        Decompressed body bytes
+    """
+    max_size = max_size or settings.MAX_FILE_SIZE
+    guard = _SizeGuard(max_size)
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_size:
+        raise HTTPException(status_code=413, detail=f"Request body exceeds {max_size} bytes")
+
+    encoding = request.headers.get("content-encoding", "identity").strip().lower() or "identity"
+    if encoding not in DECODERS:
+        raise HTTPException(status_code=415, detail=f"Unsupported content encoding '{encoding}'")
+    decoder = DECODERS[encoding](guard)
+
+    parts = []
+    async for chunk in request.stream():
+        guard.add_compressed(len(chunk))
+        parts.append(decoder.decode(chunk))
+    decoder.finish()
+
+    return b"".join(parts)
+
+
+def _parse_msgpack(body: bytes) -> Dict[str, Any]:
+    if not MSGPACK_AVAILABLE:
+        raise HTTPException(status_code=415, detail="MessagePack bodies are not supported on this server")
+    import msgpack
+
+    try:
+        return msgpack.unpackb(body, raw=False, strict_map_key=False)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid MessagePack body: {e!r}")
+
+
+async def parse_body(request: Request, model: Type[ModelT]) -> ModelT:
+    """
+    Decode a JSON or MessagePack body, optionally gzip/zstd compressed, into a model
+
+    Args:
+        request: Incoming request
+        model: Pydantic model to validate into
+
+    Returns:
+        Validated model instance
+    """
+    body = await read_body(request)
+    content_type = request.headers.get("content-type", "application/json").split(";")[0].strip().lower()
+
+    try:
+        if content_type in MSGPACK_CONTENT_TYPES:
+            return model.model_validate(_parse_msgpack(body))
+        if content_type in JSON_CONTENT_TYPES or content_type.endswith("+json"):
+            return model.model_validate_json(body)
+    except ValidationError as e:
+        # Same 422 response FastAPI gives for bodies it parses itself
+        raise RequestValidationError(e.errors())
+
+    raise HTTPException(status_code=415, detail=f"Unsupported content type '{content_type}'")
+
+
+def openapi_body(model: Type[BaseModel]) -> Dict[str, Any]:
+    """OpenAPI request body for routes that parse their own body with parse_body"""
+    schema = model.model_json_schema()
+    definitions = schema.pop("$defs", {})
+
+    def inline(node: Any) -> Any:
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return inline(definitions[node["$ref"].split("/")[-1]])
+            return {key: inline(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [inline(value) for value in node]
+        return node
+
+    schema = inline(schema)
+    return {
+        "requestBody": {
+            "required": True,
+            "description": "JSON or MessagePack; may be sent with Content-Encoding gzip or zstd",
+            "content": {
+                "application/json": {"schema": schema},
+                "application/msgpack": {"schema": schema},
+            },
+        }
+    }
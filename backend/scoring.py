@@ -0,0 +1,237 @@
+import math
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+from config import settings
+
+if TYPE_CHECKING:
+    import numpy as np  # imported on first use; only ScoreMatrix.simulate needs it
+
+# Fixed column order of the category score matrix
+CATEGORY_ORDER = tuple(settings.SCORING_WEIGHTS.keys())
+
+
+def weighted_total(scores: Sequence[Any], weights: Sequence[Any]) -> Any:
+    """
+    Sum of score x weight over CATEGORY_ORDER, accumulated left to right
+
+    Works on plain numbers and on numpy arrays alike, and both give
+    bit-identical totals, so simulated scores match stored ones exactly.
+    """
+    total = 0.0
+    for score, weight in zip(scores, weights):
+        total = total + score * weight
+    return total
+
+
+def overall_score(categories: Dict[str, Any], weights: Optional[Dict[str, float]] = None) -> int:
+    """
+    Overall score of an analysis, truncated to an int
+
+    Args:
+        categories: Category name to score record
+        weights: Category weights (defaults to settings)
+    """
+    weights = weights or settings.SCORING_WEIGHTS
+    return int(weighted_total(
+        [categories[name].score for name in CATEGORY_ORDER],
+        [weights.get(name, 0.0) for name in CATEGORY_ORDER],
+    ))
+
+
+class ScoreMatrix:
+    """Stored category scores of every analysis, kept as a dense matrix"""
+
+    def __init__(self, initial_capacity: int = 256):
+        self._initial_capacity = initial_capacity
+        self._scores: Optional["np.ndarray"] = None  # allocated on first use
+        # Removed rows are left as holes (None ids) until the next compaction
+        self._ids: List[Optional[str]] = []
+        self._names: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._holes = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _matrix(self) -> "np.ndarray":
+        """Score storage, allocated (and numpy imported) on first use"""
+        if self._scores is None:
+            import numpy as np
+
+            self._scores = np.zeros((self._initial_capacity, len(CATEGORY_ORDER)), dtype=np.float64)
+        return self._scores
+
+    def add(self, analysis_id: str, app_name: str, categories: Dict[str, Any]) -> None:
+        """
+        Record the category scores of an analysis
+
+        Args:
+            analysis_id: Analysis identifier
+            app_name: Application name
+            categories: Category name to score model (or plain dict)
+        """
+        row = [_category_score(categories.get(name)) for name in CATEGORY_ORDER]
+
+        scores = self._matrix()
+        index = self._rows.get(analysis_id)
+        if index is None:
+            index = len(self._ids)
+            if index == scores.shape[0]:
+                import numpy as np
+
+                grown = np.zeros((index * 2, len(CATEGORY_ORDER)), dtype=np.float64)
+                grown[:index] = scores
+                self._scores = grown
+            self._ids.append(analysis_id)
+            self._names.append(app_name)
+            self._rows[analysis_id] = index
+
+        self._names[index] = app_name
+        self._scores[index] = row
+
+    def remove(self, analysis_id: str) -> None:
+        """Drop an analysis; storage is compacted once holes outnumber live rows"""
+        index = self._rows.pop(analysis_id, None)
+        if index is None:
+            return
+
+        self._ids[index] = None
+        self._names[index] = None
+        self._holes += 1
+        if self._holes > len(self._rows):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Close holes left by remove(), keeping insertion order"""
+        keep = [index for index, analysis_id in enumerate(self._ids) if analysis_id is not None]
+        self._scores[:len(keep)] = self._scores[keep]
+        self._ids = [self._ids[index] for index in keep]
+        self._names = [self._names[index] for index in keep]
+        self._rows = {analysis_id: index for index, analysis_id in enumerate(self._ids)}
+        self._holes = 0
+
+    def simulate(
+        self,
+        weight_vectors: Sequence[Dict[str, float]],
+        baseline: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Recompute overall scores and rankings under candidate weightings
+
+        Args:
+            weight_vectors: Candidate category weights, one dict per policy
+            baseline: Weights to compare against (defaults to settings)
+
+        Returns:
+            Baseline and per-policy scores, ranks and rank changes
+        """
+        import numpy as np
+
+        if not weight_vectors:
+            raise ValueError("At least one weight vector is required")
+        if self._holes:
+            self._compact()
+
+        policies = [baseline or settings.SCORING_WEIGHTS, *weight_vectors]
+        weights = np.column_stack([_weight_column(policy) for policy in policies])
+
+        # Every analysis under every policy at once, with the same arithmetic
+        # (and truncation) as the stored scores
+        count = len(self._ids)
+        scores = self._matrix()
+        columns = [scores[:count, j, None] for j in range(len(CATEGORY_ORDER))]
+        overall = np.trunc(weighted_total(columns, weights)).astype(np.int64)
+        ranks = np.column_stack([_rank_descending(overall[:, i]) for i in range(len(policies))])
+        deltas = ranks[:, :1] - ranks[:, 1:]
+
+        return self._format(policies, weights, overall, ranks, deltas)
+
+    def _format(
+        self,
+        policies: List[Dict[str, float]],
+        weights: "np.ndarray",
+        overall: "np.ndarray",
+        ranks: "np.ndarray",
+        deltas: "np.ndarray",
+    ) -> Dict[str, Any]:
+        """Build the JSON-friendly simulation report"""
+        import numpy as np
+
+        count = len(self._ids)
+        summaries = []
+        for i in range(len(policies)):
+            order = np.lexsort((np.arange(count), ranks[:, i]))
+            summary = {
+                "weights": dict(zip(CATEGORY_ORDER, weights[:, i].round(6).tolist())),
+                "rankings": [
+                    {
+                        "analysisId": self._ids[row],
+                        "appName": self._names[row],
+                        "overallScore": int(overall[row, i]),
+                        "rank": int(ranks[row, i]),
+                    }
+                    for row in order
+                ],
+            }
+            if i > 0:
+                summary["rankChanges"] = [
+                    {
+                        "analysisId": self._ids[row],
+                        "appName": self._names[row],
+                        "fromRank": int(ranks[row, 0]),
+                        "toRank": int(ranks[row, i]),
+                        "change": int(deltas[row, i - 1]),
+                    }
+                    for row in np.flatnonzero(deltas[:, i - 1])
+                ]
+            summaries.append(summary)
+
+        return {
+            "analysisCount": count,
+            "baseline": summaries[0],
+            "policies": summaries[1:],
+        }
+
+
+def _category_score(category: Any) -> float:
+    """Read a score from a CategoryScoreModel or its dict form"""
+    if category is None:
+        return 0.0
+    if isinstance(category, dict):
+        return float(category["score"])
+    return float(category.score)
+
+
+def _weight_column(weights: Dict[str, float]) -> "np.ndarray":
+    """
+    Validate a weight dict and turn it into a column vector
+
+    Weights summing to 1 are used as given, exactly as the pipeline applies
+    them; any other total is normalized to 1.
+    """
+    unknown = set(weights) - set(CATEGORY_ORDER)
+    if unknown:
+        raise ValueError(f"Unknown scoring categories: {', '.join(sorted(unknown))}")
+
+    values = [float(weights.get(name, 0.0)) for name in CATEGORY_ORDER]
+    if not all(math.isfinite(value) for value in values):
+        raise ValueError("Scoring weights must be finite numbers")
+
+    import numpy as np
+
+    column = np.array(values)
+    if (column < 0).any():
+        raise ValueError("Scoring weights must be non-negative")
+
+    total = column.sum()
+    if total <= 0:
+        raise ValueError("Scoring weights must not all be zero")
+
+    return column if abs(total - 1.0) <= 1e-9 else column / total
+
+
+def _rank_descending(scores: "np.ndarray") -> "np.ndarray":
+    """Competition ranking (1 = best); equal scores share a rank"""
+    import numpy as np
+
+    ascending = np.sort(scores)
+    return len(scores) - np.searchsorted(ascending, scores, side="right") + 1
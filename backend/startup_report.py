@@ -0,0 +1,136 @@
+"""
+Cold-start report for the ProdLens API
+
+Measures, in fresh interpreters:
+  * the import-time breakdown of `import main` (via python -X importtime)
+  * wall time from process spawn to the first successful /api/health
+
+    python startup_report.py
+    python startup_report.py --json --max-health-ms 2500
+
+With --max-import-ms / --max-health-ms the exit code is 1 when a budget is
+exceeded, so the report can gate CI against cold-start regressions.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_imports(top: int) -> Dict[str, Any]:
+    """Import main in a fresh interpreter and group self-time by top-level package"""
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    by_package: Dict[str, int] = defaultdict(int)
+    total_us = 0
+    for line in completed.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        by_package[module.split(".")[0]] += int(self_us)
+        if module == "main" and len(indent) == 1:
+            total_us = int(cumulative_us)
+
+    packages = sorted(by_package.items(), key=lambda item: item[1], reverse=True)
+    return {
+        "importMainMs": round(total_us / 1000, 1),
+        "interpreterWallMs": round(wall_ms, 1),
+        "topPackages": [
+            {"package": name, "selfMs": round(us / 1000, 1)}
+            for name, us in packages[:top]
+        ],
+    }
+
+
+def measure_first_health(port: int, timeout: float) -> Dict[str, Any]:
+    """Start uvicorn and poll /api/health until the first successful answer"""
+    url = f"http://127.0.0.1:{port}/api/health"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+
+    try:
+        while time.perf_counter() - start < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"Server exited early: {process.stderr.read().decode()[-500:]}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    body = json.loads(response.read())
+                    if body.get("success"):
+                        return {"firstHealthMs": round((time.perf_counter() - start) * 1000, 1)}
+            except (urllib.error.URLError, ConnectionError):
+                pass
+            time.sleep(0.01)
+
+        raise RuntimeError(f"/api/health did not succeed within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Human-readable report"""
+    imports = report["imports"]
+    print(f"import main:         {imports['importMainMs']} ms "
+          f"(interpreter wall {imports['interpreterWallMs']} ms)")
+    print(f"first /api/health:   {report['health']['firstHealthMs']} ms")
+    print("Import self-time by package:")
+    for entry in imports["topPackages"]:
+        print(f"  {entry['selfMs']:>9} ms  {entry['package']}")
+    for failure in report["budgetFailures"]:
+        print(f"BUDGET EXCEEDED: {failure}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Report ProdLens API cold-start time")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the throwaway server")
+    parser.add_argument("--top", type=int, default=15, help="Packages to list in the import breakdown")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for /api/health")
+    parser.add_argument("--max-import-ms", type=float, default=None, help="Fail if import main is slower")
+    parser.add_argument("--max-health-ms", type=float, default=None, help="Fail if first health is slower")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = {
+        "imports": measure_imports(args.top),
+        "health": measure_first_health(args.port, args.timeout),
+        "budgetFailures": [],
+    }
+
+    if args.max_import_ms is not None and report["imports"]["importMainMs"] > args.max_import_ms:
+        report["budgetFailures"].append(f"import main > {args.max_import_ms} ms")
+    if args.max_health_ms is not None and report["health"]["firstHealthMs"] > args.max_health_ms:
+        report["budgetFailures"].append(f"first /api/health > {args.max_health_ms} ms")
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    sys.exit(1 if report["budgetFailures"] else 0)
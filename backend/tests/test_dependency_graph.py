@@ -0,0 +1,161 @@
+import json
+import pytest
+from dependency_graph import parse_lockfile, parse_package_lock, parse_requirements
+from pipeline import extract_lockfile
+
+# Root with one production dependency (a) and a dev tool pulling in b
+V1_LOCK = {
+    "lockfileVersion": 1,
+    "dependencies": {
+        "a": {"version": "1.0.0"},
+        "jest": {"version": "29.0.0", "dev": True, "requires": {"b": "^2.0.0"}},
+        "b": {"version": "2.0.0", "dev": True},
+    },
+}
+V3_LOCK = {
+    "lockfileVersion": 3,
+    "packages": {
+        "": {"dependencies": {"a": "^1.0.0"}, "devDependencies": {"jest": "^29.0.0"}},
+        "node_modules/a": {"version": "1.0.0"},
+        "node_modules/jest": {"version": "29.0.0", "dev": True, "dependencies": {"b": "^2.0.0"}},
+        "node_modules/b": {"version": "2.0.0", "dev": True},
+    },
+}
+
+
+def stats(lock, include_dev=False):
+    return parse_package_lock(json.dumps(lock), include_dev=include_dev).stats()
+
+
+def test_dev_packages_are_skipped_in_every_lockfile_version():
+    v1, v3 = stats(V1_LOCK), stats(V3_LOCK)
+    assert v1 == v3
+    assert v3.totalPackages == 1
+    assert v3.fanInHotSpots == ()
+
+
+def test_dev_packages_are_kept_with_include_dev():
+    v1, v3 = stats(V1_LOCK, include_dev=True), stats(V3_LOCK, include_dev=True)
+    assert v1.totalPackages == v3.totalPackages == 3
+    assert v3.directCount == 2
+    assert v3.maxDepth == 2
+    assert v3.fanInHotSpots == (("b", 1),)
+
+
+# Same project as both lockfile formats: a -> b -> d@1, a -> d@2 (nested),
+# @s/c -> b, plus a dev tool, a workspace link and an unresolvable name
+PACKAGES_LOCK = {
+    "lockfileVersion": 3,
+    "packages": {
+        "": {
+            "dependencies": {"a": "^1.0.0", "@s/c": "^1.0.0", "local": "*", "missing": "^1.0.0"},
+            "devDependencies": {"jest": "^29.0.0"},
+        },
+        "node_modules/a": {"version": "1.0.0", "dependencies": {"b": "^1.0.0", "d": "^2.0.0"}},
+        "node_modules/b": {"version": "1.0.0", "dependencies": {"d": "^1.0.0"}},
+        "node_modules/d": {"version": "1.0.0"},
+        "node_modules/a/node_modules/d": {"version": "2.0.0"},
+        "node_modules/@s/c": {"version": "1.0.0", "dependencies": {"b": "^1.0.0"}},
+        "node_modules/jest": {"version": "29.0.0", "dev": True},
+        "node_modules/local": {"resolved": "packages/local", "link": True},
+    },
+}
+NESTED_LOCK = {
+    "lockfileVersion": 1,
+    "dependencies": {
+        "a": {
+            "version": "1.0.0",
+            "requires": {"b": "^1.0.0", "d": "^2.0.0"},
+            "dependencies": {"d": {"version": "2.0.0"}},
+        },
+        "b": {"version": "1.0.0", "requires": {"d": "^1.0.0"}},
+        "d": {"version": "1.0.0"},
+        "@s/c": {"version": "1.0.0", "requires": {"b": "^1.0.0"}},
+        "jest": {"version": "29.0.0", "dev": True},
+    },
+}
+
+
+def test_packages_lock_follows_node_resolution():
+    graph = parse_package_lock(json.dumps(PACKAGES_LOCK))
+    result = graph.stats()
+
+    assert graph.direct_dependencies() == {"a": "1.0.0", "@s/c": "1.0.0"}
+    assert result.totalPackages == 5
+    assert result.directCount == 2
+    assert result.maxDepth == 3  # a -> b -> d@1
+    assert result.duplicateVersions == {"d": ("1.0.0", "2.0.0")}
+    assert result.fanInHotSpots == (("b", 2), ("d", 1), ("d", 1))
+
+
+def test_nested_lock_resolves_through_enclosing_scopes():
+    graph = parse_package_lock(json.dumps(NESTED_LOCK))
+    result = graph.stats()
+
+    # v1 locks don't list the root's dependencies: every hoisted entry is direct
+    assert graph.direct_dependencies() == {"a": "1.0.0", "b": "1.0.0", "d": "1.0.0", "@s/c": "1.0.0"}
+    assert result.totalPackages == 5
+    assert result.maxDepth == 2
+    assert result.duplicateVersions == {"d": ("1.0.0", "2.0.0")}
+    assert result.fanInHotSpots == (("b", 2), ("d", 1), ("d", 1))
+
+
+def test_requirements_are_flat_direct_dependencies():
+    graph = parse_requirements([
+        "# pinned for production",
+        "",
+        "-r base.txt",
+        "--hash=sha256:abc",
+        "-e git+https://example.com/repo.git#egg=thing",
+        "Django==4.2.1",
+        "requests[security] >= 2.0 ; python_version > '3'",
+        "Flask_Login",
+        "numpy==1.26.0  # pinned",
+    ])
+    result = graph.stats()
+
+    assert graph.direct_dependencies() == {
+        "django": "4.2.1",
+        "requests": ">= 2.0",
+        "flask-login": "",
+        "numpy": "1.26.0",
+    }
+    assert (result.totalPackages, result.directCount, result.maxDepth) == (4, 4, 1)
+    assert result.duplicateVersions == {}
+    assert result.fanInHotSpots == ()
+
+
+def test_empty_lockfiles():
+    for graph in (parse_package_lock("{}"), parse_requirements([])):
+        result = graph.stats()
+        assert (result.totalPackages, result.directCount, result.maxDepth) == (0, 0, 0)
+
+
+@pytest.mark.parametrize("filename, content, roots", [
+    ("frontend/package-lock.json", json.dumps(PACKAGES_LOCK), {"a", "@s/c"}),
+    ("C:\\app\\npm-shrinkwrap.json", json.dumps(NESTED_LOCK), {"a", "b", "d", "@s/c"}),
+    (None, json.dumps(PACKAGES_LOCK), {"a", "@s/c"}),
+    ("requirements-dev.txt", "pytest==8.0\n", {"pytest"}),
+    (None, "pytest==8.0\n", {"pytest"}),
+])
+def test_parse_lockfile_detects_the_format(filename, content, roots):
+    assert set(parse_lockfile(content, filename).direct_dependencies()) == roots
+
+
+def test_parse_lockfile_rejects_unknown_files():
+    with pytest.raises(ValueError):
+        parse_lockfile("{}", "Pipfile.lock")
+
+
+def test_extract_lockfile_merges_direct_dependencies():
+    app_config = {
+        "name": "Test App",
+        "dependencies": {"a": "^9.0.0"},
+        "lockfile": json.dumps(PACKAGES_LOCK),
+        "lockfileName": "package-lock.json",
+    }
+    config, result = extract_lockfile(app_config)
+
+    assert "lockfile" not in config and "lockfileName" not in config
+    assert config["dependencies"] == {"a": "^9.0.0", "@s/c": "1.0.0"}
+    assert result.totalPackages == 5
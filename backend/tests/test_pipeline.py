@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from ai_analyzer import DEFAULT_RECOMMENDATIONS, DEFAULT_TEST_SUGGESTIONS
+from pipeline import (
+    ANALYZERS,
+    CATEGORY_SECTIONS,
+    ai_analyzer,
+    analyze_sections,
+    dependent_sections,
+    parse_sections,
+    perform_analysis,
+    plan_sections,
+    reanalyze,
+)
+from scoring import overall_score
+
+APP_CONFIG = {
+    "name": "Test App",
+    "description": "Dashboard with reports",
+    "blocks": {"components": [{"id": f"component-{i}", "type": "table"} for i in range(7)]},
+    "dependencies": {"react": "^18.2.0", "jest": "^29.0.0", "redis": "^4.6.0"},
+    "metadata": {"estimatedUsers": 20000, "complexity": "high"},
+}
+
+
+def analyze(app_config=APP_CONFIG, **kwargs):
+    return asyncio.run(perform_analysis(app_config, "Test App", use_ai=False, **kwargs))
+
+
+def without_timestamp(result):
+    return result._replace(timestamp="")
+
+
+# Section planning
+
+def test_parse_sections_defaults_to_all():
+    assert parse_sections(None) is None
+
+
+def test_parse_sections_expands_groups_and_drops_duplicates():
+    assert parse_sections(" risks, categories ,security,risks,") == ("risks", *CATEGORY_SECTIONS)
+
+
+@pytest.mark.parametrize("value", ["bogus", "security,bogus", "", " , "])
+def test_parse_sections_rejects_unknown_or_empty(value):
+    with pytest.raises(ValueError):
+        parse_sections(value)
+
+
+def test_plan_sections_puts_requirements_first():
+    assert plan_sections(["overallScore", "risks"]) == [*CATEGORY_SECTIONS, "overallScore", "risks"]
+    assert plan_sections(["security", "overallScore"]) == ["security", *[
+        name for name in CATEGORY_SECTIONS if name != "security"
+    ], "overallScore"]
+
+
+def test_dependent_sections_follows_requirements_in_registry_order():
+    assert dependent_sections(["security"]) == ["security", "overallScore"]
+    assert dependent_sections(["risks"]) == ["risks"]
+    assert dependent_sections(["overallScore", "scalability"]) == ["scalability", "overallScore"]
+
+
+# Full and partial analysis
+
+def test_serial_analysis_matches_concurrent():
+    assert without_timestamp(analyze(serial=True)) == without_timestamp(analyze())
+
+
+def test_serial_analysis_keeps_ai_calls_off_the_event_loop(monkeypatch):
+    threads = []
+
+    def create(**kwargs):
+        threads.append(threading.current_thread())
+        time.sleep(0.05)
+        raise RuntimeError("mock outage")
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(ai_analyzer, "is_available", lambda: True)
+    monkeypatch.setattr(ai_analyzer, "_client", client)
+
+    fallbacks = []
+    result = asyncio.run(perform_analysis(APP_CONFIG, "Test App", serial=True, ai_fallbacks=fallbacks))
+
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+    assert sorted(fallbacks) == ["recommendations", "testSuggestions"]
+    assert result.testSuggestions is DEFAULT_TEST_SUGGESTIONS
+    assert result.recommendations is DEFAULT_RECOMMENDATIONS
+
+
+def test_analyze_sections_returns_only_requested_sections():
+    data = asyncio.run(analyze_sections(APP_CONFIG, "Test App", ["security", "risks"], use_ai=False))
+    full = analyze().to_model().dict()
+
+    assert set(data) == {"appName", "timestamp", "categories", "risks"}
+    assert data["categories"] == {"security": full["categories"]["security"]}
+    assert data["risks"] == full["risks"]
+
+
+def test_analyze_sections_computes_but_omits_requirements():
+    data = asyncio.run(analyze_sections(APP_CONFIG, "Test App", ["overallScore"], use_ai=False))
+    assert set(data) == {"appName", "timestamp", "overallScore"}
+    assert data["overallScore"] == analyze().overallScore
+
+
+# Partial re-analysis
+
+def test_reanalyze_reuses_sections_that_are_not_stale():
+    previous = analyze()
+    edited = dict(previous.categories, security=previous.categories["security"]._replace(score=0))
+    previous = previous._replace(categories=edited, overallScore=-1)
+
+    result = asyncio.run(reanalyze(APP_CONFIG, previous, ["overallScore"], use_ai=False))
+
+    for name in CATEGORY_SECTIONS:
+        assert result.categories[name] is previous.categories[name]
+    assert result.risks is previous.risks
+    assert result.overallScore == overall_score(edited)
+
+
+def test_reanalyze_recomputes_sections_requiring_stale_ones():
+    previous = analyze()
+    stale_previous = previous._replace(
+        categories=dict(previous.categories, security=previous.categories["security"]._replace(score=0)),
+        overallScore=-1,
+    )
+
+    result = asyncio.run(reanalyze(APP_CONFIG, stale_previous, ["security"], use_ai=False))
+
+    assert result.categories["security"] == previous.categories["security"]
+    assert result.overallScore == previous.overallScore
+    assert result.scaleAnalysis is previous.scaleAnalysis
+
+
+def test_reanalyze_of_everything_matches_fresh_analysis():
+    previous = analyze({"name": "Other App"})
+    result = asyncio.run(reanalyze(APP_CONFIG, previous, list(ANALYZERS), use_ai=False))
+    assert without_timestamp(result)._replace(appName="Test App") == without_timestamp(analyze())
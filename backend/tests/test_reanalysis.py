@@ -0,0 +1,211 @@
+import asyncio
+import pytest
+from config import settings
+from pipeline import ANALYZERS, ai_analyzer, perform_analysis
+from scoring import overall_score
+from reanalysis import (
+    PRIORITY_AI,
+    PRIORITY_MISSING,
+    PRIORITY_SCORES,
+    AnalysisVersion,
+    ReanalysisScheduler,
+    TrackedApp,
+    current_version,
+    stale_sections,
+)
+
+RULE_SECTIONS = [name for name, analyzer in ANALYZERS.items() if not analyzer.ai]
+AI_SECTIONS = [name for name, analyzer in ANALYZERS.items() if analyzer.ai]
+
+APP_CONFIG = {"name": "Test App", "dependencies": {"react": "^18.2.0"}}
+RESULT = asyncio.run(perform_analysis(APP_CONFIG, "Test App", use_ai=False))
+
+
+class FakeStore:
+    """Stands in for main.store_analysis"""
+
+    def __init__(self):
+        self.stored = []
+
+    def __call__(self, result, analysis_id=None):
+        self.stored.append(result)
+        return analysis_id or f"analysis_{len(self.stored)}"
+
+
+@pytest.fixture
+def tracked_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "TRACKED_APPS_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Pretend an LLM is configured (no calls are made by these tests)"""
+    monkeypatch.setattr(ai_analyzer, "is_available", lambda: True)
+
+
+# Staleness
+
+V1 = AnalysisVersion(rules="1", weights="w1", model="gpt-a")
+
+
+def test_stale_sections_same_version():
+    assert stale_sections(V1, V1) == []
+
+
+def test_stale_sections_weights_change_only_overall_score():
+    assert stale_sections(V1, V1._replace(weights="w2")) == ["overallScore"]
+
+
+def test_stale_sections_rules_change_every_rule_section():
+    assert stale_sections(V1, V1._replace(rules="2", weights="w2")) == RULE_SECTIONS
+
+
+def test_stale_sections_model_change_only_ai_sections():
+    assert stale_sections(V1, V1._replace(model="gpt-b")) == AI_SECTIONS
+    assert stale_sections(V1._replace(model=None), V1) == AI_SECTIONS
+
+
+def test_stale_sections_keeps_ai_output_without_an_llm():
+    assert stale_sections(V1, V1._replace(model=None)) == []
+
+
+def test_stale_sections_combines_rules_and_model_changes():
+    assert stale_sections(V1, V1._replace(rules="2", model="gpt-b")) == RULE_SECTIONS + AI_SECTIONS
+
+
+# Queue priority
+
+def tracked(scheduler, tracked_id, version=None, analyzed_at=None, use_ai=True):
+    app = TrackedApp(tracked_id, tracked_id, APP_CONFIG, use_ai)
+    if version is not None:
+        app.result = RESULT
+        app.version = version
+        app.analyzedAt = analyzed_at
+    scheduler.apps[tracked_id] = app
+    return app
+
+
+def test_priority_orders_missing_then_scores_then_ai(tracked_dir, llm):
+    scheduler = ReanalysisScheduler(FakeStore())
+    current = current_version(True)
+    outdated_ai = tracked(scheduler, "ai", current._replace(model="old-model"), "2024-01-01")
+    outdated_scores = tracked(scheduler, "scores", current._replace(weights="old"), "2024-01-03")
+    older_scores = tracked(scheduler, "older", current._replace(rules="old"), "2024-01-02")
+    missing = tracked(scheduler, "missing")
+    fresh = tracked(scheduler, "fresh", current, "2024-01-01")
+
+    assert scheduler._priority(missing) == PRIORITY_MISSING
+    assert scheduler._priority(outdated_scores) == PRIORITY_SCORES
+    assert scheduler._priority(outdated_ai) == PRIORITY_AI
+    assert scheduler._priority(fresh) is None
+
+    analyzed = []
+
+    async def fake_analyze(app, stale):
+        analyzed.append((app.trackedId, stale))
+        app.version = current_version(app.useAi)
+
+    scheduler._analyze = fake_analyze
+    assert scheduler.scan() == 4
+
+    async def drain():
+        while await scheduler.run_next():
+            pass
+
+    asyncio.run(drain())
+
+    assert [tracked_id for tracked_id, _ in analyzed] == ["missing", "older", "scores", "ai"]
+    assert dict(analyzed) == {
+        "missing": list(ANALYZERS),
+        "older": RULE_SECTIONS,
+        "scores": ["overallScore"],
+        "ai": AI_SECTIONS,
+    }
+    assert scheduler.queue_length() == 0
+
+
+def test_enqueue_keeps_the_most_urgent_entry(tracked_dir):
+    scheduler = ReanalysisScheduler(FakeStore())
+    app = tracked(scheduler, "app")
+    scheduler.enqueue(app, PRIORITY_AI)
+    scheduler.enqueue(app, PRIORITY_MISSING)
+    scheduler.enqueue(app, PRIORITY_SCORES)
+
+    assert scheduler.queue_length() == 1
+    assert scheduler._queued["app"] == PRIORITY_MISSING
+
+
+def test_run_next_skips_apps_that_are_no_longer_stale(tracked_dir):
+    scheduler = ReanalysisScheduler(FakeStore())
+    app = tracked(scheduler, "app", current_version(True)._replace(weights="old"), "2024-01-01")
+    scheduler.enqueue(app, PRIORITY_SCORES)
+    app.version = current_version(app.useAi)
+
+    assert asyncio.run(scheduler.run_next()) is None
+
+
+def test_failed_reanalysis_is_retried_up_to_the_limit(tracked_dir):
+    scheduler = ReanalysisScheduler(FakeStore())
+    app = tracked(scheduler, "app")
+    attempts = []
+
+    async def failing_analyze(app, stale):
+        attempts.append(app.trackedId)
+        raise RuntimeError("boom")
+
+    scheduler._analyze = failing_analyze
+    scheduler.enqueue(app, PRIORITY_MISSING)
+
+    async def drain():
+        while await scheduler.run_next():
+            pass
+
+    asyncio.run(drain())
+
+    assert len(attempts) == settings.REANALYSIS_MAX_ATTEMPTS
+    assert app.lastError == "boom"
+
+
+# Registration and persistence
+
+def test_register_requires_tracked_apps_dir(monkeypatch):
+    monkeypatch.setattr(settings, "TRACKED_APPS_DIR", "")
+    scheduler = ReanalysisScheduler(FakeStore())
+    with pytest.raises(RuntimeError):
+        asyncio.run(scheduler.register("Test App", APP_CONFIG, use_ai=False))
+
+
+def test_tracked_apps_survive_a_restart(tracked_dir):
+    store = FakeStore()
+    app = asyncio.run(ReanalysisScheduler(store).register("Test App", APP_CONFIG, use_ai=False))
+    assert (tracked_dir / f"{app.trackedId}.json").exists()
+
+    restarted = ReanalysisScheduler(FakeStore())
+    restarted.load()
+    restored = restarted.apps[app.trackedId]
+
+    assert restored.result == app.result
+    assert restored.version == app.version
+    assert restored.stale_sections() == []
+    assert restarted.scan() == 0
+
+
+def test_weight_change_after_restart_recomputes_only_the_overall_score(tracked_dir, monkeypatch):
+    app = asyncio.run(ReanalysisScheduler(FakeStore()).register("Test App", APP_CONFIG, use_ai=False))
+
+    weights = dict(settings.SCORING_WEIGHTS, security=settings.SCORING_WEIGHTS["security"] + 0.1)
+    monkeypatch.setattr(settings, "SCORING_WEIGHTS", weights)
+
+    store = FakeStore()
+    restarted = ReanalysisScheduler(store)
+    restarted.load()
+    assert restarted.scan() == 1
+    assert restarted.apps[app.trackedId].stale_sections() == ["overallScore"]
+
+    assert asyncio.run(restarted.run_next()) == app.trackedId
+    result = restarted.apps[app.trackedId].result
+    assert result.categories == app.result.categories
+    assert result.risks == app.result.risks
+    assert result.overallScore == overall_score(result.categories, weights)
+    assert restarted.apps[app.trackedId].stale_sections() == []
@@ -0,0 +1,24 @@
+from ai_analyzer import DEFAULT_RECOMMENDATIONS
+from analysis_engine import MISSING_CACHE_RISK
+from records import CategoryScore, to_model
+
+
+def test_interned_constants_share_one_model():
+    assert to_model(MISSING_CACHE_RISK) is to_model(MISSING_CACHE_RISK)
+    assert to_model(DEFAULT_RECOMMENDATIONS[0]) is to_model(DEFAULT_RECOMMENDATIONS[0])
+
+
+def test_other_records_get_a_fresh_model_each_time():
+    record = CategoryScore(score=80, level="Good", issues=("a",), suggestions=())
+    first, second = to_model(record), to_model(record)
+
+    assert first is not second
+    first.issues.append("b")
+    assert second.issues == ["a"]
+    assert to_model(record).issues == ["a"]
+
+
+def test_equal_record_that_is_not_the_constant_is_not_shared():
+    copy = MISSING_CACHE_RISK._replace()
+    assert to_model(copy) is not to_model(MISSING_CACHE_RISK)
+    assert to_model(copy) == to_model(MISSING_CACHE_RISK)
@@ -0,0 +1,154 @@
+import gzip
+import json
+import pytest
+from fastapi.testclient import TestClient
+import main
+import request_body
+from config import settings
+
+BODY = {"appConfig": {"name": "Test App", "description": "x" * 200}, "appName": "Test App"}
+RAW = json.dumps(BODY).encode()
+MAX_SIZE = 64 * 1024
+
+client = TestClient(main.app)
+
+
+@pytest.fixture(autouse=True)
+def small_cap(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", MAX_SIZE)
+
+
+def post(content, encoding=None, content_type="application/json"):
+    headers = {"Content-Type": content_type}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return client.post("/api/analyze?ai=false", content=content, headers=headers)
+
+
+def chunked(data, size=7):
+    """Stream the body in small chunks (no Content-Length)"""
+    return iter([data[i:i + size] for i in range(0, len(data), size)])
+
+
+def bomb(size):
+    """Valid JSON that decompresses to size bytes"""
+    return b'{"appName": "Test App", "appConfig": {"name": "' + b"a" * size + b'"}}'
+
+
+def assert_analyzed(response):
+    assert response.status_code == 200
+    assert response.json()["success"] is True
+    assert response.json()["data"]["appName"] == "Test App"
+
+
+def assert_error(response, status, detail):
+    assert response.status_code == status
+    assert detail in response.json()["detail"]
+
+
+# Plain and gzip bodies
+
+def test_plain_json():
+    assert_analyzed(post(RAW))
+
+
+def test_gzip_streamed_in_small_chunks():
+    assert_analyzed(post(chunked(gzip.compress(RAW)), "gzip"))
+
+
+def test_gzip_concatenated_members():
+    half = len(RAW) // 2
+    assert_analyzed(post(chunked(gzip.compress(RAW[:half]) + gzip.compress(RAW[half:])), "x-gzip"))
+
+
+def test_gzip_truncated():
+    assert_error(post(gzip.compress(RAW)[:-10], "gzip"), 400, "Truncated gzip body")
+
+
+def test_gzip_invalid():
+    assert_error(post(b"not gzip at all", "gzip"), 400, "Invalid gzip body")
+
+
+def test_gzip_high_ratio_under_the_cap_is_accepted():
+    # Thousands to one, but within MAX_FILE_SIZE once decompressed
+    compressed = gzip.compress(bomb(MAX_SIZE - 100))
+    assert len(compressed) * 100 < MAX_SIZE
+    assert_analyzed(post(compressed, "gzip"))
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_gzip_bomb_is_stopped_at_the_cap(stream):
+    compressed = gzip.compress(bomb(50 * MAX_SIZE))
+    assert_error(post(chunked(compressed, 1024) if stream else compressed, "gzip"), 413, "Decompressed body exceeds")
+
+
+def test_compressed_body_over_the_cap():
+    assert_error(post(b"x" * (MAX_SIZE + 1)), 413, "Request body exceeds")
+    assert_error(post(chunked(b"x" * (MAX_SIZE + 1), 4096)), 413, "Request body exceeds")
+
+
+# zstd
+
+def test_zstd_concatenated_frames_streamed():
+    zstandard = pytest.importorskip("zstandard")
+    compressor = zstandard.ZstdCompressor()
+    half = len(RAW) // 2
+    assert_analyzed(post(chunked(compressor.compress(RAW[:half]) + compressor.compress(RAW[half:])), "zstd"))
+
+
+def test_zstd_truncated():
+    zstandard = pytest.importorskip("zstandard")
+    assert_error(post(zstandard.ZstdCompressor().compress(RAW)[:-5], "zstd"), 400, "Truncated zstd body")
+
+
+def test_zstd_invalid():
+    pytest.importorskip("zstandard")
+    assert_error(post(b"definitely not zstd", "zstd"), 400, "Invalid zstd body")
+
+
+def test_zstd_bomb_is_stopped_at_the_cap():
+    zstandard = pytest.importorskip("zstandard")
+    compressed = zstandard.ZstdCompressor().compress(bomb(50 * MAX_SIZE))
+    assert_error(post(compressed, "zstd"), 413, "Decompressed body exceeds")
+
+
+def test_zstd_without_the_codec(monkeypatch):
+    monkeypatch.setattr(request_body, "ZSTD_AVAILABLE", False)
+    assert_error(post(b"\x28\xb5\x2f\xfd", "zstd"), 415, "zstd content encoding is not supported")
+
+
+# MessagePack
+
+def test_msgpack_body():
+    msgpack = pytest.importorskip("msgpack")
+    assert_analyzed(post(msgpack.packb(BODY), content_type="application/msgpack"))
+
+
+def test_msgpack_gzip_body():
+    msgpack = pytest.importorskip("msgpack")
+    assert_analyzed(post(gzip.compress(msgpack.packb(BODY)), "gzip", "application/x-msgpack"))
+
+
+def test_msgpack_invalid():
+    pytest.importorskip("msgpack")
+    assert_error(post(b"\xc1", content_type="application/msgpack"), 400, "Invalid MessagePack body")
+
+
+def test_msgpack_without_the_codec(monkeypatch):
+    monkeypatch.setattr(request_body, "MSGPACK_AVAILABLE", False)
+    assert_error(post(b"\x80", content_type="application/msgpack"), 415, "MessagePack bodies are not supported")
+
+
+# Unsupported and invalid bodies
+
+def test_unsupported_encoding():
+    assert_error(post(RAW, "br"), 415, "Unsupported content encoding 'br'")
+
+
+def test_unsupported_content_type():
+    assert_error(post(RAW, content_type="text/plain"), 415, "Unsupported content type 'text/plain'")
+
+
+def test_invalid_model_gets_a_validation_error():
+    response = post(json.dumps({"appConfig": 5}).encode())
+    assert response.status_code == 422
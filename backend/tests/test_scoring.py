@@ -0,0 +1,133 @@
+import asyncio
+import math
+import random
+import pytest
+from config import settings
+from pipeline import perform_analysis
+from records import CategoryScore
+from scoring import CATEGORY_ORDER, ScoreMatrix, overall_score
+
+
+def categories(*scores):
+    return {
+        name: CategoryScore(score=score, level="", issues=(), suggestions=())
+        for name, score in zip(CATEGORY_ORDER, scores)
+    }
+
+
+def rankings(summary):
+    return {entry["analysisId"]: (entry["overallScore"], entry["rank"]) for entry in summary["rankings"]}
+
+
+def test_baseline_matches_stored_overall_scores():
+    matrix = ScoreMatrix()
+    stored = {}
+    configs = [
+        {"name": "a"},
+        {"name": "b", "dependencies": {"redis": "1", "jest": "1", "passport": "1"}},
+        {"name": "c", "blocks": {"components": [{"id": i} for i in range(30)]},
+         "metadata": {"estimatedUsers": 100000, "complexity": "high"}},
+    ]
+    for index, config in enumerate(configs):
+        result = asyncio.run(perform_analysis(config, config["name"], use_ai=False))
+        matrix.add(f"analysis_{index}", result.appName, result.to_model().categories)
+        stored[f"analysis_{index}"] = result.overallScore
+
+    simulation = matrix.simulate([settings.SCORING_WEIGHTS])
+    assert {key: score for key, (score, _) in rankings(simulation["baseline"]).items()} == stored
+
+
+def test_simulated_scores_match_overall_score_exactly():
+    # Round scores and weights land exactly on integers, where truncation
+    # exposes any difference in the last bit of the weighted sum (a plain
+    # matrix product disagrees on ~0.7% of these)
+    rng = random.Random(3)
+    matrix = ScoreMatrix()
+    rows = {}
+    for index in range(500):
+        rows[f"analysis_{index}"] = categories(*(rng.randint(0, 10) * 10 for _ in CATEGORY_ORDER))
+        matrix.add(f"analysis_{index}", "app", rows[f"analysis_{index}"])
+
+    policies = []
+    while len(policies) < 50:
+        parts = [rng.randint(0, 10) for _ in CATEGORY_ORDER]
+        if sum(parts):
+            policies.append({name: part / sum(parts) for name, part in zip(CATEGORY_ORDER, parts)})
+
+    simulation = matrix.simulate(policies)
+    for weights, summary in zip(policies, simulation["policies"]):
+        for analysis_id, (score, _) in rankings(summary).items():
+            assert score == overall_score(rows[analysis_id], weights)
+
+
+def test_ranks_ties_and_rank_changes():
+    matrix = ScoreMatrix()
+    matrix.add("secure", "Secure", categories(0, 100, 0, 0, 0))
+    matrix.add("scalable", "Scalable", categories(100, 0, 0, 0, 0))
+    matrix.add("twin", "Twin", categories(100, 0, 0, 0, 0))
+
+    simulation = matrix.simulate([{"security": 1.0}], baseline={"scalability": 1.0})
+
+    assert [(entry["analysisId"], entry["rank"]) for entry in simulation["baseline"]["rankings"]] == [
+        ("scalable", 1), ("twin", 1), ("secure", 3),
+    ]
+    policy = simulation["policies"][0]
+    assert rankings(policy) == {"secure": (100, 1), "scalable": (0, 2), "twin": (0, 2)}
+    assert [(change["analysisId"], change["fromRank"], change["toRank"], change["change"])
+            for change in policy["rankChanges"]] == [
+        ("secure", 3, 1, 2), ("scalable", 1, 2, -1), ("twin", 1, 2, -1),
+    ]
+
+
+def test_weights_are_normalized_unless_they_sum_to_one():
+    matrix = ScoreMatrix()
+    matrix.add("a", "A", categories(80, 40, 0, 0, 0))
+
+    simulation = matrix.simulate([{"scalability": 3, "security": 1}])
+
+    assert simulation["policies"][0]["weights"]["scalability"] == 0.75
+    assert rankings(simulation["policies"][0])["a"] == (70, 1)
+
+
+def test_simulate_after_removals_keeps_remaining_rows_in_order():
+    matrix = ScoreMatrix(initial_capacity=2)
+    for index in range(6):
+        matrix.add(f"analysis_{index}", f"App {index}", categories(*[index * 10] * 5))
+    for index in (0, 2, 3, 4):
+        matrix.remove(f"analysis_{index}")
+    matrix.remove("unknown")
+    matrix.add("analysis_6", "App 6", categories(*[5] * 5))
+    matrix.add("analysis_1", "App 1 again", categories(*[90] * 5))
+
+    simulation = matrix.simulate([{"security": 1.0}])
+
+    assert len(matrix) == simulation["analysisCount"] == 3
+    assert [(entry["analysisId"], entry["appName"], entry["overallScore"])
+            for entry in simulation["baseline"]["rankings"]] == [
+        ("analysis_1", "App 1 again", 90), ("analysis_5", "App 5", 50), ("analysis_6", "App 6", 5),
+    ]
+
+
+def test_simulate_with_no_analyses():
+    simulation = ScoreMatrix().simulate([{"security": 1.0}])
+    assert simulation["analysisCount"] == 0
+    assert simulation["baseline"]["rankings"] == []
+
+
+@pytest.mark.parametrize("weights, message", [
+    ({"security": math.nan}, "finite"),
+    ({"security": math.inf}, "finite"),
+    ({"security": -1.0, "performance": 2.0}, "non-negative"),
+    ({"security": 0.0}, "all be zero"),
+    ({"uptime": 1.0}, "Unknown scoring categories"),
+])
+def test_invalid_weights_are_rejected(weights, message):
+    matrix = ScoreMatrix()
+    matrix.add("a", "A", categories(50, 50, 50, 50, 50))
+    with pytest.raises(ValueError, match=message):
+        matrix.simulate([weights])
+
+
+def test_simulate_requires_a_weight_vector():
+    with pytest.raises(ValueError):
+        ScoreMatrix().simulate([])
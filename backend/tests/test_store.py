@@ -0,0 +1,36 @@
+import asyncio
+import pytest
+import main
+from config import settings
+from pipeline import perform_analysis
+from scoring import ScoreMatrix
+
+RESULT = asyncio.run(perform_analysis({"name": "Test App"}, "Test App", use_ai=False))
+
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.setattr(main, "analysis_cache", {})
+    monkeypatch.setattr(main, "score_matrix", ScoreMatrix())
+    monkeypatch.setattr(settings, "MAX_STORED_ANALYSES", 2)
+    return main
+
+
+def test_oldest_analysis_is_evicted_first(store):
+    first = store.store_analysis(RESULT)
+    second = store.store_analysis(RESULT)
+    third = store.store_analysis(RESULT)
+
+    assert list(store.analysis_cache) == [second, third]
+    assert len(store.score_matrix) == 2
+    assert first not in store.score_matrix._rows
+
+
+def test_replaced_analysis_counts_as_newest(store):
+    first = store.store_analysis(RESULT)
+    second = store.store_analysis(RESULT)
+    assert store.store_analysis(RESULT, first) == first
+    third = store.store_analysis(RESULT)
+
+    assert list(store.analysis_cache) == [first, third]
+    assert second not in store.score_matrix._rows